@@ -1,13 +1,36 @@
+# print_function is kept because action.yml may run this with whatever
+# "python" is on the runner, which can still be Python 2
 from __future__ import print_function
+import argparse
 import json
 import os
 
-with open('about.json') as f:
-    about = json.load(f)
+parser = argparse.ArgumentParser(
+    description="Write the MD4C versions from about.json as step outputs")
+parser.add_argument(
+    '--legacy-set-output', action='store_true',
+    help="use ::set-output workflow commands instead of $GITHUB_OUTPUT, for "
+         "runners that predate $GITHUB_OUTPUT")
+args = parser.parse_args()
+
+
+def write_outputs(outputs):
+    """Write step outputs given as 'name=value' lines"""
+    if args.legacy_set_output:
+        for line in outputs.splitlines():
+            name, value = line.split('=', 1)
+            print('::set-output name=' + name + '::' + value)
+    else:
+        with open(os.environ['GITHUB_OUTPUT'], 'w') as f:
+            print(outputs, end='', file=f)
+
+
+# Read the whole file in one go and parse the bytes directly
+with open('about.json', 'rb') as f:
+    about = json.loads(f.read().decode('utf-8'))
 
 min_version = about['md4c-version']['min']
 max_version = about['md4c-version']['max']
 
-with open(os.environ['GITHUB_OUTPUT'], 'w') as f:
-    print('md4c=' + max_version, file=f)
-    print('md4c-min=' + min_version, file=f)
+outputs = 'md4c=' + max_version + '\n' + 'md4c-min=' + min_version + '\n'
+write_outputs(outputs)
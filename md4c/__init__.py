@@ -28,8 +28,76 @@
 # IN THE SOFTWARE.
 #
 
-# ._md4c contains GenericParser, HTMLRenderer, exceptions, flags,
-# and lookup_entity
-from ._md4c import *    # noqa: F401, F403
-from .enums import BlockType, SpanType, TextType, Align     # noqa: F401
-from .parser import ParserObject    # noqa: F401
+import importlib as _importlib
+import sys as _sys
+
+# Names are imported from their submodules on first access (PEP 562) so that
+# importing md4c does not load everything up front. This maps each public name
+# to the submodule that defines it.
+_submodule_names = {
+    # ._md4c contains GenericParser, HTMLRenderer, exceptions, flags,
+    # lookup_entity, and markdown_to_html
+    '._md4c': (
+        'GenericParser',
+        'HTMLRenderer',
+        'ParseError',
+        'StopParsing',
+        'lookup_entity',
+        'markdown_to_html',
+        'MD_FLAG_COLLAPSEWHITESPACE',
+        'MD_FLAG_PERMISSIVEATXHEADERS',
+        'MD_FLAG_PERMISSIVEURLAUTOLINKS',
+        'MD_FLAG_PERMISSIVEEMAILAUTOLINKS',
+        'MD_FLAG_NOINDENTEDCODEBLOCKS',
+        'MD_FLAG_NOHTMLBLOCKS',
+        'MD_FLAG_NOHTMLSPANS',
+        'MD_FLAG_TABLES',
+        'MD_FLAG_STRIKETHROUGH',
+        'MD_FLAG_PERMISSIVEWWWAUTOLINKS',
+        'MD_FLAG_TASKLISTS',
+        'MD_FLAG_LATEXMATHSPANS',
+        'MD_FLAG_WIKILINKS',
+        'MD_FLAG_UNDERLINE',
+        'MD_FLAG_PERMISSIVEAUTOLINKS',
+        'MD_FLAG_NOHTML',
+        'MD_DIALECT_COMMONMARK',
+        'MD_DIALECT_GITHUB',
+        'MD_HTML_FLAG_DEBUG',
+        'MD_HTML_FLAG_VERBATIM_ENTITIES',
+        'MD_HTML_FLAG_SKIP_UTF8_BOM',
+        'MD_HTML_FLAG_XHTML',
+    ),
+    '.enums': ('BlockType', 'SpanType', 'TextType', 'Align'),
+    '.parser': ('ParserObject',),
+}
+
+_lazy_names = {name: submodule
+               for submodule, names in _submodule_names.items()
+               for name in names}
+
+__all__ = list(_lazy_names)
+
+
+def __getattr__(name):
+    try:
+        submodule = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+    value = getattr(_importlib.import_module(submodule, __name__), name)
+    # Cache on the module so later lookups do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Module __getattr__ is not supported before Python 3.7, so import everything
+# eagerly there
+if _sys.version_info < (3, 7):
+    for _name in __all__:
+        globals()[_name] = __getattr__(_name)
+    del _name
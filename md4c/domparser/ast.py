@@ -25,21 +25,244 @@
 # IN THE SOFTWARE.
 #
 
-import urllib.parse as _url_parse
+import functools as _functools
+import re as _re
+import sys as _sys
 from collections.abc import ByteString as _ByteString
 
-from .. import lookup_entity as _lookup_entity
+from .._md4c import lookup_entity as _lookup_entity
 from ..enums import BlockType as _BlockType
 from ..enums import SpanType as _SpanType
 from ..enums import TextType as _TextType
 from ..enums import Align as _Align
 
 
+###############################################################################
+# Escaping helpers                                                            #
+###############################################################################
+
+
+# Default for TextNode.html_escape_table. _html_escape() does not use it:
+# str.translate() with a table that maps characters to strings takes a slow
+# path for each character, which chained str.replace() calls (each a fast
+# search when the character is absent) avoid. Only a subclass that replaces
+# the table goes through translate().
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+})
+
+
+def _html_escape(text):
+    # Module-level so TextNode.render() can call it without going through
+    # the html_escape() classmethod
+    # '&' must be replaced first
+    if isinstance(text, str):
+        return (text.replace('&', '&amp;').replace('<', '&lt;')
+                .replace('>', '&gt;').replace('"', '&quot;'))
+    # bytes.translate() can only map bytes to single bytes, and decoding,
+    # translating the str, and encoding again is much slower
+    return (bytes(text).replace(b'&', b'&amp;').replace(b'<', b'&lt;')
+            .replace(b'>', b'&gt;').replace(b'"', b'&quot;'))
+
+
+# Characters left alone by URL escaping: those urllib.parse.quote() never
+# quotes, plus the ones MD4C's HTML renderer also leaves alone
+_URL_SAFE = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+                      '0123456789_.-~!*(),%#@?=;:/+$&')
+
+# Percent-encoding of every byte value
+_PCT = tuple('%%%02X' % b for b in range(256))
+
+_NON_ASCII_RE = _re.compile(r'[^\x00-\x7f]+')
+
+
+if _sys.version_info >= (3, 8):
+    def _percent_encode(data):
+        # bytes.hex() with a separator does the whole run in C
+        return '%' + data.hex('%').upper()
+else:
+    def _percent_encode(data):
+        return ''.join([_PCT[b] for b in data])
+
+
+def _percent_encode_match(match):
+    # Raises UnicodeEncodeError for lone surrogates, like quote() does
+    return _percent_encode(match.group().encode('utf-8'))
+
+
+def _url_escape_entry(b):
+    c = chr(b)
+    if c == '&':
+        return '&amp;'
+    if c in _URL_SAFE:
+        return c
+    return _PCT[b]
+
+
+# Translation tables for str and for bytes (which are percent-encoded byte
+# by byte after being decoded as Latin-1). Many documents have no links or
+# images at all, so these are only built the first time they are needed.
+_URL_ESCAPE_TABLE = None
+_URL_ESCAPE_BYTES_TABLE = None
+
+
+def _build_url_escape_tables():
+    global _URL_ESCAPE_TABLE, _URL_ESCAPE_BYTES_TABLE
+    _URL_ESCAPE_BYTES_TABLE = {b: _url_escape_entry(b) for b in range(256)}
+    _URL_ESCAPE_TABLE = {b: _URL_ESCAPE_BYTES_TABLE[b] for b in range(128)}
+
+
+def _url_escape(text):
+    if _URL_ESCAPE_TABLE is None:
+        _build_url_escape_tables()
+    if isinstance(text, str):
+        # The table only covers ASCII. Anything else is left as is by
+        # translate() and percent-encoded as UTF-8 afterwards.
+        return _NON_ASCII_RE.sub(_percent_encode_match,
+                                 text.translate(_URL_ESCAPE_TABLE))
+    return (text.decode('latin_1').translate(_URL_ESCAPE_BYTES_TABLE)
+            .encode('ascii'))
+
+
+# Text nodes tend to repeat the same short strings (single words,
+# punctuation, URLs in link-heavy documents), so escaped results for text up
+# to _ESCAPE_CACHE_MAX_LEN characters are memoized. Longer text is escaped
+# directly, since it rarely repeats and would only push useful entries out of
+# the cache. Both values can be tuned by editing them here.
+_ESCAPE_CACHE_MAX_LEN = 64
+_ESCAPE_CACHE_SIZE = 4096
+
+_html_escape_cached = _functools.lru_cache(_ESCAPE_CACHE_SIZE)(_html_escape)
+_url_escape_cached = _functools.lru_cache(_ESCAPE_CACHE_SIZE)(_url_escape)
+
+
+def _translate_entity(entity):
+    # Translate an HTML entity to the text it stands for
+    text = _lookup_entity(entity)
+    if isinstance(text, str):
+        # Need to check for null characters in case the entity was '&#0;'
+        text = text.replace('\x00', '\ufffd')
+        if isinstance(entity, _ByteString):
+            text = text.encode()
+    return text
+
+
+@_functools.lru_cache(_ESCAPE_CACHE_SIZE)
+def _render_entity(entity, url_escape):
+    # Translate and escape an HTML entity. Documents use a small set of
+    # entities over and over, so the results are memoized.
+    text = _translate_entity(entity)
+    if url_escape:
+        return _url_escape(text)
+    return _html_escape(text)
+
+
 ###############################################################################
 # Abstract base classes                                                       #
 ###############################################################################
 
 
+#: Maps each :class:`md4c.BlockType`, :class:`md4c.SpanType`, and
+#: :class:`md4c.TextType` member to the :class:`ASTNode` subclass constructed
+#: for it. Subclassing with an ``element_type`` class argument updates this
+#: dict. Calling ``NODE_FACTORY[element_type](element_type, **kwargs)`` skips
+#: the lookup that ``ASTNode(element_type, **kwargs)`` has to do.
+NODE_FACTORY = dict()
+
+
+# How _render_tree_into() renders each kind of node, as given by the
+# _render_kind class attribute:
+# - _RENDER_LEAF: append render()
+# - _RENDER_OTHER: call _render_into() (a class with its own _render_into())
+# - _RENDER_GENERIC: render_pre(), children, render_post()
+# - _RENDER_STATIC: the class's precomputed tags, children, tags
+# - _RENDER_IMAGE: like _RENDER_GENERIC, with image_nesting_level incremented
+#   for the image and its children
+# - _RENDER_SKIP: children only (a _transparent_in_image node in an image)
+# - _RENDER_TEXT: the text, escaped the way TextNode.render() does it (a text
+#   class that does not override render() or the escaping hooks)
+# - _RENDER_STATIC_TEXT: the class's precomputed text for inside or outside of
+#   images
+# - _RENDER_RAW_TEXT: the node's text, unescaped
+# - _RENDER_STATIC_CLOSE: like _RENDER_GENERIC, but with the class's
+#   precomputed closing tag instead of render_post()
+# - _RENDER_ENTITY: the entity, translated the way HTMLEntity.render() does
+#   it (through the same cache) for a class that does not override the
+#   escaping hooks
+# The precomputed tags of _RENDER_STATIC and _RENDER_STATIC_CLOSE are the ones
+# for outside of images. Inside an image, such nodes are rendered as
+# _RENDER_SKIP if they are _transparent_in_image and as _RENDER_GENERIC
+# otherwise.
+_RENDER_LEAF = 0
+_RENDER_OTHER = 1
+_RENDER_GENERIC = 2
+_RENDER_STATIC = 3
+_RENDER_IMAGE = 4
+_RENDER_SKIP = 5
+_RENDER_TEXT = 6
+_RENDER_STATIC_TEXT = 7
+_RENDER_RAW_TEXT = 8
+_RENDER_STATIC_CLOSE = 9
+_RENDER_ENTITY = 10
+
+
+def _inherited_attr(cls, name):
+    # The attribute cls gets for name from its MRO, as stored in the class
+    # that defines it (so classmethods compare by identity)
+    for base in cls.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name]
+    return None
+
+
+# Placeholder for attributes that have not been converted from the parser's
+# form yet
+_NOT_BUILT = object()
+
+
+def _new_text(text_type, text, use_bytes):
+    """Build the node for a piece of text from the parser. This is the same as
+    ``NODE_FACTORY[text_type](text_type, use_bytes=use_bytes, text=text)``,
+    but skips the calls to :meth:`ASTNode.__new__` and the ``__init__()``
+    chain unless the class has changed them. Text nodes are by far the most
+    common nodes in an AST, so this matters for parsing speed.
+
+    The text is assumed to already be :class:`bytes` if ``use_bytes`` is True
+    and :class:`str` otherwise.
+    """
+    cls = NODE_FACTORY[text_type]
+    if not cls._direct_init:
+        return cls(text_type, use_bytes=use_bytes, text=text)
+    node = object.__new__(cls)
+    node.type = text_type
+    node.bytes = use_bytes
+    node.parent = None
+    node.text = text
+    return node
+
+
+def _new_container(element_type, use_bytes, details):
+    """Build the node for a block or span from the parser. This is the same
+    as ``NODE_FACTORY[element_type](element_type, use_bytes=use_bytes,
+    **details)``, but like :func:`_new_text`, skips the constructor calls for
+    classes that take no details (paragraphs, block quotes, emphasis, etc.)
+    unless the class has changed them.
+    """
+    cls = NODE_FACTORY[element_type]
+    if details or not cls._direct_init:
+        return cls(element_type, use_bytes=use_bytes, **details)
+    node = object.__new__(cls)
+    node.type = element_type
+    node.bytes = use_bytes
+    node.parent = None
+    node.children = []
+    node._render_cache = None
+    return node
+
+
 # For more information on this technique, see:
 # https://stackoverflow.com/a/28076300
 class ASTNode:
@@ -63,21 +286,64 @@ class ASTNode:
                       if it should render as :class:`str`. Defaults to False.
     :type use_bytes: bool, optional
     """
-    _registry = dict()
+    # Every class in this module defines __slots__, which keeps large ASTs
+    # much smaller in memory. Subclasses that do not define __slots__ get a
+    # __dict__ as usual.
+    __slots__ = ('type', 'bytes', 'parent', '__weakref__')
+
+    # Kept for backward compatibility. This is the same dict as NODE_FACTORY.
+    _registry = NODE_FACTORY
 
     @classmethod
     def __init_subclass__(cls, element_type, **kwargs):
         super().__init_subclass__(**kwargs)
         # Register cls as the class to create for element_type
         if element_type is not None:
-            cls._registry[element_type] = cls
+            NODE_FACTORY[element_type] = cls
+        # A class that overrides render() without also overriding
+        # _render_into() must still have its render() called when it is
+        # rendered as part of a larger tree
+        if 'render' in cls.__dict__ and '_render_into' not in cls.__dict__:
+            cls._render_into = ASTNode._render_into
+            if '_render_kind' not in cls.__dict__:
+                cls._render_kind = _RENDER_LEAF
+        elif ('_render_into' in cls.__dict__ and
+                '_render_kind' not in cls.__dict__):
+            cls._render_kind = _RENDER_OTHER
+        # Likewise, a class that changes how it renders can no longer be
+        # skipped over in image alt text unless it says so
+        if ('_transparent_in_image' not in cls.__dict__ and
+                any(method in cls.__dict__ for method in (
+                    'render', 'render_pre', 'render_post', '_render_into'))):
+            cls._transparent_in_image = False
+        # Nodes can only be built without calling the class (see _new_text())
+        # if construction works the way it does for the class that allowed
+        # it. __new__() and __init__() are looked up through the MRO, since
+        # a mixin listed before that class may override them.
+        if cls._direct_init and '_direct_init' not in cls.__dict__:
+            base = next(base for base in cls.__mro__
+                        if base.__dict__.get('_direct_init'))
+            if any(_inherited_attr(cls, name) is not
+                   _inherited_attr(base, name)
+                   for name in ('__new__', '__init__')):
+                cls._direct_init = False
+
+    # True if a node can be built by setting its attributes on
+    # object.__new__(cls) instead of calling cls()
+    _direct_init = False
+
+    _render_kind = _RENDER_LEAF
+
+    # True for classes that render nothing of their own inside an image
+    # (when image_nesting_level > 0), only their children. Image alt text
+    # rendering skips straight to the children of such nodes.
+    _transparent_in_image = False
 
     def __new__(cls, element_type, use_bytes=False, **kwargs):
         # Select the appropriate subclass. There should never be a KeyError,
-        # and if there is, it means we forgot to add a class in this module for
-        # one of the BlockType/SpanType/TextType members.
-        subcls = cls._registry[element_type]
-        return object.__new__(subcls)
+        # and if there is, it means we forgot to add a class in this module
+        # for one of the BlockType/SpanType/TextType members.
+        return object.__new__(NODE_FACTORY[element_type])
 
     # This isn't strictly necessary--the type of element is encoded in the type
     # of the object. But if a user decides to replace one of the built-in
@@ -111,9 +377,24 @@ class ASTNode:
             return None
         result = []
         for text_type, text in attribute:
-            result.append(ASTNode(text_type, use_bytes=self.bytes, text=text))
+            result.append(NODE_FACTORY[text_type](
+                text_type, use_bytes=self.bytes, text=text))
         return result
 
+    def _check_raw_attr(self, attribute):
+        # Raise the TypeError attr_to_ast() would for an attribute whose text
+        # does not match use_bytes, for attributes whose conversion is
+        # deferred
+        if attribute is None:
+            return
+        for _, text in attribute:
+            if isinstance(text, _ByteString) != self.bytes:
+                if self.bytes:
+                    raise TypeError(
+                        "Must set use_bytes=True when text is bytes")
+                raise TypeError(
+                    "Must not set use_bytes=True when text is str")
+
     def render_attr(self, attribute, url_escape=False):
         """Render an attribute given as a list of :class:`ASTNode` or None
 
@@ -127,11 +408,66 @@ class ASTNode:
         """
         if attribute is None:
             return b'' if self.bytes else ''
+        renderings = [text.render(url_escape=url_escape) for text in attribute]
+        return b''.join(renderings) if self.bytes else ''.join(renderings)
+
+    def _render_raw_attr(self, attribute, url_escape=False):
+        # Like render_attr(), but for an attribute still in the list of
+        # 2-tuples form the parser provides. Text of types rendered by the
+        # standard TextNode.render() or HTMLEntity.render() with the stock
+        # escaping hooks, or with static text, is rendered directly, without
+        # building text nodes, using the same caches. (Links to the same URL
+        # tend to recur throughout a document.)
+        if attribute is None:
+            return b'' if self.bytes else ''
+        if url_escape:
+            escape = _url_escape
+            escape_cached = _url_escape_cached
+        else:
+            escape = _html_escape
+            escape_cached = _html_escape_cached
+        if len(attribute) == 1:
+            # Most attributes are a single run of plain text (a URL with no
+            # entities in it, say), which needs no list to join
+            text_type, text = attribute[0]
+            node_class = NODE_FACTORY[text_type]
+            if (node_class.render is TextNode.render and
+                    node_class._stock_escape and
+                    len(text) <= _ESCAPE_CACHE_MAX_LEN and
+                    not isinstance(text, bytearray)):
+                return escape_cached(text)
+        url_escape = bool(url_escape)
         renderings = []
-        for text in attribute:
-            renderings.append(text.render(url_escape=url_escape))
+        for text_type, text in attribute:
+            node_class = NODE_FACTORY[text_type]
+            render = node_class.render
+            if render is TextNode.render and node_class._stock_escape:
+                if (len(text) <= _ESCAPE_CACHE_MAX_LEN and
+                        not isinstance(text, bytearray)):
+                    renderings.append(escape_cached(text))
+                else:
+                    renderings.append(escape(text))
+            elif render is HTMLEntity.render and node_class._stock_escape:
+                if isinstance(text, bytearray):
+                    text = bytes(text)
+                renderings.append(_render_entity(text, url_escape))
+            elif node_class._render_kind == _RENDER_STATIC_TEXT:
+                renderings.append(node_class._static_text_bytes[0]
+                                  if self.bytes
+                                  else node_class._static_text_str[0])
+            else:
+                node = node_class(text_type, use_bytes=self.bytes, text=text)
+                renderings.append(node.render(url_escape=url_escape))
         return b''.join(renderings) if self.bytes else ''.join(renderings)
 
+    def _render_lazy_attr(self, attribute, raw, url_escape=False):
+        # Render an attribute that is only converted to a list of ASTNode
+        # when accessed: from the parser's form (raw) if it has not been
+        # accessed (attribute is _NOT_BUILT), otherwise from the list
+        if attribute is _NOT_BUILT:
+            return self._render_raw_attr(raw, url_escape)
+        return self.render_attr(attribute, url_escape)
+
     def render(self, **kwargs):
         """Render this node and its children. This base implementation returns
         an empty string, but subclasses should override as appropriate.
@@ -146,6 +482,71 @@ class ASTNode:
         """
         return b'' if self.bytes else ''
 
+    def _render_into(self, out, kwargs):
+        # Append the rendering of this node to the list out. Containers
+        # override this so that a whole tree is rendered into one list and
+        # joined once, rather than joining at every level. kwargs is the dict
+        # of keyword arguments for render(), passed as-is rather than
+        # unpacked so every node in the tree can share the same dict.
+        out.append(self.render(**kwargs))
+
+    def render_iter(self, **kwargs):
+        """Render this node and its children, yielding the output in pieces
+        rather than returning it all at once. For a container, the pieces are
+        its opening, the rendered output of each of its children in turn, and
+        its closing. This base implementation yields the output of
+        :meth:`render` as a single piece.
+
+        :param kwargs: Data to pass to :meth:`render`, as for :meth:`render`.
+
+        :returns: Iterator over the rendered output
+        :rtype: Iterator of str or bytes
+        """
+        yield self.render(**kwargs)
+
+    def render_to_stream(self, stream, **kwargs):
+        """Render this node and its children, writing the output to *stream*
+        piece by piece rather than returning it. This allows large documents
+        to be written out to a file or socket without ever holding the full
+        output in memory.
+
+        :param stream: Where to write the output. Either a file-like object
+                       with a ``write()`` method (a text stream for
+                       :class:`str` nodes or a binary stream for
+                       :class:`bytes` nodes) or, for :class:`bytes` nodes, a
+                       :class:`bytearray` to extend.
+        :param kwargs: Data to pass to :meth:`render`, as for :meth:`render`.
+        """
+        if isinstance(stream, bytearray):
+            write = stream.extend
+        else:
+            write = stream.write
+        buffer = _StreamBuffer(write, b'' if self.bytes else '')
+        self._render_into(buffer, kwargs)
+        buffer.flush()
+
+
+# Number of rendered pieces render_to_stream() collects before joining them
+# and writing them out. Writing each tag and piece of text separately makes a
+# slow write() call per piece.
+_STREAM_BUFFER_ITEMS = 1024
+
+
+class _StreamBuffer(list):
+    """A list of rendered pieces that _render_tree_into() periodically joins
+    and writes to a stream"""
+    __slots__ = ('write', 'empty')
+
+    def __init__(self, write, empty):
+        super().__init__()
+        self.write = write
+        self.empty = empty
+
+    def flush(self):
+        if self:
+            self.write(self.empty.join(self))
+            del self[:]
+
 
 class ContainerNode(ASTNode, element_type=None):
     """ContainerNode(element_type, **kwargs)
@@ -156,12 +557,78 @@ class ContainerNode(ASTNode, element_type=None):
     :param element_type: A :class:`md4c.BlockType`, or :class:`md4c.SpanType`
                          representing the type of this element
     """
+    __slots__ = ('children', '_render_cache')
+
+    _direct_init = True
+
+    # Subclasses set this to True if render_pre() and render_post() always
+    # return the same thing regardless of the node's attributes or the render
+    # arguments (or, for _transparent_in_image classes, always return the
+    # same thing outside of images). The tags for such classes are computed
+    # once per class, saving two method calls per node. The classes
+    # themselves stay ordinary class definitions rather than being generated,
+    # so they keep their documented render_pre() and render_post() and can be
+    # subclassed like any other node class.
+    _static_tags = False
+
+    # Likewise, subclasses set this to True if only render_post() always
+    # returns the same thing, saving one method call per node
+    _static_close_tag = False
+
+    _render_kind = _RENDER_GENERIC
+
+    @classmethod
+    def __init_subclass__(cls, element_type, **kwargs):
+        super().__init_subclass__(element_type=element_type, **kwargs)
+        if '_render_into' in cls.__dict__:
+            # Defined by the class itself (or by the render() override
+            # handling in ASTNode)
+            return
+        overrides_tags = ('render_pre' in cls.__dict__ or
+                          'render_post' in cls.__dict__)
+        if (cls._static_tags and overrides_tags and
+                '_static_tags' not in cls.__dict__):
+            # A subclass of a static class changed the tags without saying
+            # they are still static
+            cls._static_tags = False
+            cls._render_into = ContainerNode._render_into
+            cls._render_kind = _RENDER_GENERIC
+        elif cls._static_tags:
+            node = object.__new__(cls)
+            node.bytes = False
+            # Interned so that every class and node rendering the same tag
+            # shares one string
+            cls._static_tags_str = (_sys.intern(node.render_pre()),
+                                    _sys.intern(node.render_post()))
+            node.bytes = True
+            cls._static_tags_bytes = (node.render_pre(), node.render_post())
+            cls._render_into = _render_static_into
+            cls._render_kind = _RENDER_STATIC
+        elif ('render_post' in cls.__dict__ and
+                '_static_close_tag' not in cls.__dict__):
+            if cls._static_close_tag:
+                cls._static_close_tag = False
+                cls._render_into = ContainerNode._render_into
+                cls._render_kind = _RENDER_GENERIC
+        elif cls._static_close_tag:
+            node = object.__new__(cls)
+            node.bytes = False
+            cls._static_close_tag_str = _sys.intern(node.render_post())
+            node.bytes = True
+            cls._static_close_tag_bytes = node.render_post()
+            cls._render_into = _render_static_close_into
+            cls._render_kind = _RENDER_STATIC_CLOSE
+
     def __init__(self, element_type, **kwargs):
         super().__init__(element_type, **kwargs)
 
         #: A list of this node's children.
         self.children = []
 
+        # Rendered output keyed by render arguments, or None if render caching
+        # is not enabled for this node
+        self._render_cache = None
+
     def append(self, node):
         """Add a new child to the node and set its parent to this object
 
@@ -173,6 +640,8 @@ class ContainerNode(ASTNode, element_type=None):
             raise ValueError("Cannot add a bytes node to a str node")
         node.parent = self
         self.children.append(node)
+        if self._render_cache is not None:
+            self._adopt_into_render_cache(node)
 
     def insert(self, i, node):
         """Insert a new child into the node at index *i*
@@ -186,6 +655,8 @@ class ContainerNode(ASTNode, element_type=None):
             raise ValueError("Cannot add a bytes node to a str node")
         node.parent = self
         self.children.insert(i, node)
+        if self._render_cache is not None:
+            self._adopt_into_render_cache(node)
 
     def render_pre(self, **kwargs):
         """Render the opening for this node. This base implementation returns
@@ -225,13 +696,217 @@ class ContainerNode(ASTNode, element_type=None):
                   can be replaced to render any output format necessary.
         :rtype: str or bytes
         """
-        renderings = [self.render_pre(**kwargs)]
-        for child in self.children:
-            renderings.append(child.render(**kwargs))
-        renderings.append(self.render_post(**kwargs))
-
+        renderings = []
+        _render_tree_into(self, renderings, kwargs, _RENDER_GENERIC)
         return b''.join(renderings) if self.bytes else ''.join(renderings)
 
+    def _render_into(self, out, kwargs):
+        _render_tree_into(self, out, kwargs, _RENDER_GENERIC)
+
+    def render_iter(self, **kwargs):
+        """Render this node and its children, yielding the output in pieces
+        rather than returning it all at once: the opening for this node, the
+        rendered output of each child in turn, then the closing for this node.
+        This lets output be sent on (e.g. in an HTTP response) while the rest
+        of the document is still being rendered.
+
+        Classes that override :meth:`render` are rendered as a single piece.
+
+        :param kwargs: Data to pass to :meth:`render`, as for :meth:`render`.
+
+        :returns: Iterator over the rendered output
+        :rtype: Iterator of str or bytes
+        """
+        if (type(self).render is not ContainerNode.render or
+                self._render_cache is not None):
+            yield self.render(**kwargs)
+            return
+        empty = b'' if self.bytes else ''
+        yield self.render_pre(**kwargs)
+        for child in self.children:
+            renderings = []
+            child._render_into(renderings, kwargs)
+            yield empty.join(renderings)
+        yield self.render_post(**kwargs)
+
+    def enable_render_cache(self):
+        """Cache the rendered output of this node and every container below
+        it, so that rendering again only re-renders subtrees that changed.
+        Nodes added later with :meth:`append` or :meth:`insert` are cached
+        too.
+
+        Changes made through :meth:`append` and :meth:`insert` invalidate the
+        cache automatically. Any other change (modifying :attr:`children`
+        directly, or changing a node's attributes or text) must be followed
+        by a call to :meth:`invalidate_render_cache` on the parent of the
+        changed node.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._render_cache is None:
+                node._render_cache = {}
+            stack.extend(child for child in node.children
+                         if isinstance(child, ContainerNode))
+
+    def invalidate_render_cache(self):
+        """Discard the cached rendered output of this node and its ancestors
+        (see :meth:`enable_render_cache`)
+        """
+        node = self
+        while node is not None:
+            if isinstance(node, ContainerNode) and node._render_cache:
+                node._render_cache.clear()
+            node = node.parent
+
+    def _adopt_into_render_cache(self, node):
+        if isinstance(node, ContainerNode):
+            node.enable_render_cache()
+        self.invalidate_render_cache()
+
+
+def _render_static_into(self, out, kwargs):
+    # _render_into() for container classes with _static_tags
+    _render_tree_into(self, out, kwargs, _RENDER_STATIC)
+
+
+def _render_static_close_into(self, out, kwargs):
+    # _render_into() for container classes with _static_close_tag
+    _render_tree_into(self, out, kwargs, _RENDER_STATIC_CLOSE)
+
+
+def _render_tree_into(node, out, kwargs, kind):
+    # Render a container and everything below it into out, walking the tree
+    # with an explicit stack instead of recursion. Recursing costs a Python
+    # call per node and fails on deeply nested documents (e.g. thousands of
+    # nested block quotes) with RecursionError.
+    #
+    # Each node is handled according to its class's _render_kind. Only
+    # classes with their own _render_into() are rendered by calling it.
+    #
+    # Containers with a render cache (see enable_render_cache()) are looked
+    # up before being opened. On a miss, the output for the subtree is joined
+    # and stored when the container is closed, provided out is a list that
+    # can be sliced.
+    append = out.append
+    cacheable = type(out) is list
+    flush = out.flush if type(out) is _StreamBuffer else None
+    url_escape = bool(kwargs.get('url_escape', False))
+    if url_escape:
+        escape = _url_escape
+        escape_cached = _url_escape_cached
+    else:
+        escape = _html_escape
+        escape_cached = _html_escape_cached
+    # Tracked separately from kwargs so that the loop never has to look it
+    # up there
+    in_image = kwargs.get('image_nesting_level', 0) > 0
+    if in_image and (kind == _RENDER_STATIC or kind == _RENDER_STATIC_CLOSE):
+        # The precomputed tags are the ones for outside of images
+        kind = (_RENDER_SKIP if node._transparent_in_image
+                else _RENDER_GENERIC)
+    stack = []
+    while True:
+        start = key = None
+        cache = node._render_cache
+        if cache is not None:
+            try:
+                key = tuple(kwargs.items())
+                cached = cache.get(key)
+            except TypeError:
+                # Unhashable render arguments cannot be cached
+                key = cached = None
+            if cached is not None:
+                append(cached)
+                node = None
+            elif cacheable and key is not None:
+                start = len(out)
+
+        if node is not None:
+            # Open node and push it onto the stack
+            if kind == _RENDER_STATIC:
+                append(node._static_tags_bytes[0] if node.bytes
+                       else node._static_tags_str[0])
+            elif kind == _RENDER_IMAGE:
+                kwargs = dict(kwargs)
+                kwargs['image_nesting_level'] = (
+                    kwargs.get('image_nesting_level', 0) + 1)
+                in_image = True
+                append(node.render_pre(**kwargs))
+            elif kind != _RENDER_SKIP:
+                append(node.render_pre(**kwargs) if kwargs
+                       else node.render_pre())
+            stack.append((node, kind, kwargs, in_image, iter(node.children),
+                          start, key))
+
+        # Render children until reaching one to open, closing nodes as their
+        # children are exhausted
+        while stack:
+            node, kind, kwargs, in_image, children, start, key = stack[-1]
+            for child in children:
+                child_kind = child._render_kind
+                if child_kind == _RENDER_TEXT:
+                    # Inlined TextNode.render()
+                    text = child.text
+                    if (len(text) <= _ESCAPE_CACHE_MAX_LEN and
+                            not isinstance(text, bytearray)):
+                        append(escape_cached(text))
+                    else:
+                        append(escape(text))
+                    continue
+                if child_kind == _RENDER_RAW_TEXT:
+                    append(child.text)
+                    continue
+                if child_kind == _RENDER_STATIC_TEXT:
+                    append(child._static_text_bytes[in_image] if child.bytes
+                           else child._static_text_str[in_image])
+                    continue
+                if child_kind == _RENDER_ENTITY:
+                    # Inlined HTMLEntity.render()
+                    text = child.text
+                    if isinstance(text, bytearray):
+                        text = bytes(text)
+                    append(_render_entity(text, url_escape))
+                    continue
+                if child_kind == _RENDER_LEAF:
+                    append(child.render(**kwargs) if kwargs
+                           else child.render())
+                    continue
+                if child_kind == _RENDER_OTHER:
+                    child._render_into(out, kwargs)
+                    continue
+                if in_image:
+                    if child._transparent_in_image:
+                        child_kind = _RENDER_SKIP
+                    elif (child_kind == _RENDER_STATIC or
+                            child_kind == _RENDER_STATIC_CLOSE):
+                        child_kind = _RENDER_GENERIC
+                node = child
+                kind = child_kind
+                break
+            else:
+                stack.pop()
+                if kind == _RENDER_STATIC:
+                    append(node._static_tags_bytes[1] if node.bytes
+                           else node._static_tags_str[1])
+                elif kind == _RENDER_STATIC_CLOSE:
+                    append(node._static_close_tag_bytes if node.bytes
+                           else node._static_close_tag_str)
+                elif kind != _RENDER_SKIP:
+                    append(node.render_post(**kwargs) if kwargs
+                           else node.render_post())
+                if start is not None:
+                    rendered = (b''.join(out[start:]) if node.bytes
+                                else ''.join(out[start:]))
+                    out[start:] = [rendered]
+                    node._render_cache[key] = rendered
+                if flush is not None and len(out) >= _STREAM_BUFFER_ITEMS:
+                    flush()
+                continue
+            break
+        else:
+            return
+
 
 class TextNode(ASTNode, element_type=None):
     """TextNode(element_type, text, **kwargs)
@@ -243,6 +918,53 @@ class TextNode(ASTNode, element_type=None):
     :param text: The text this node represents, unprocessed
     :type text: str or bytes
     """
+    __slots__ = ('text',)
+
+    _direct_init = True
+
+    # Subclasses set this to True if render() returns the same thing
+    # regardless of the node's text and the render arguments, apart from
+    # whether the node is inside an image. The output for both cases is
+    # computed once per class, saving a method call per node.
+    _static_text = False
+
+    # False for classes that override html_escape(), url_escape(), or
+    # html_escape_table, which then have to be called instead of the
+    # module's (cached) escaping functions
+    _stock_escape = True
+
+    @classmethod
+    def __init_subclass__(cls, element_type, **kwargs):
+        super().__init_subclass__(element_type=element_type, **kwargs)
+        cls._stock_escape = all(
+            _inherited_attr(cls, name) is TextNode.__dict__[name]
+            for name in ('html_escape', 'url_escape', 'html_escape_table'))
+        # Text and entities rendered inline by _render_tree_into() use the
+        # stock escaping, so other escaping means calling render()
+        if (not cls._stock_escape and
+                cls._render_kind in (_RENDER_TEXT, _RENDER_ENTITY) and
+                '_render_kind' not in cls.__dict__):
+            cls._render_kind = _RENDER_LEAF
+        if not cls._static_text:
+            return
+        if '_static_text' not in cls.__dict__ and (
+                'render' in cls.__dict__ or '_render_into' in cls.__dict__):
+            # A subclass of a static class changed how it renders without
+            # saying it is still static
+            cls._static_text = False
+            return
+        node = object.__new__(cls)
+        node.bytes = False
+        node.text = ''
+        cls._static_text_str = (
+            _sys.intern(node.render()),
+            _sys.intern(node.render(image_nesting_level=1)))
+        node.bytes = True
+        node.text = b''
+        cls._static_text_bytes = (node.render(),
+                                  node.render(image_nesting_level=1))
+        cls._render_kind = _RENDER_STATIC_TEXT
+
     def __init__(self, element_type, text, **kwargs):
         super().__init__(element_type, **kwargs)
 
@@ -255,12 +977,9 @@ class TextNode(ASTNode, element_type=None):
         #: The unprocessed text for this node
         self.text = text
 
-    html_escape_table = {
-        ord('&'): '&amp;',
-        ord('<'): '&lt;',
-        ord('>'): '&gt;',
-        ord('"'): '&quot;',
-    }
+    _render_kind = _RENDER_TEXT
+
+    html_escape_table = _HTML_ESCAPE_TABLE
 
     @classmethod
     def html_escape(cls, text):
@@ -270,12 +989,14 @@ class TextNode(ASTNode, element_type=None):
         :type text: str or bytes
         :return: Escaped string or bytes
         """
+        table = cls.html_escape_table
+        if table is _HTML_ESCAPE_TABLE:
+            return _html_escape(text)
         if isinstance(text, str):
-            return text.translate(cls.html_escape_table)
+            return text.translate(table)
         # Hacky workaround since the bytes translate() function is not as
         # flexible as the string one
-        string = text.decode('latin_1').translate(cls.html_escape_table)
-        return string.encode('latin_1')
+        return text.decode('latin_1').translate(table).encode('latin_1')
 
     @classmethod
     def url_escape(cls, text):
@@ -285,11 +1006,7 @@ class TextNode(ASTNode, element_type=None):
         :type text: str or bytes
         :return: Escaped string or bytes
         """
-        translated = (_url_parse.quote(text, safe='-_.!*(),%#@?=;:/,+$&')
-                      .replace('&', '&amp;'))
-        if isinstance(text, str):
-            return translated
-        return translated.encode('ascii')
+        return _url_escape(text)
 
     def render(self, url_escape=False, **kwargs):
         """Render the text for this node, performing HTML or URL escaping in
@@ -305,9 +1022,22 @@ class TextNode(ASTNode, element_type=None):
         :returns: Rendered output, suitable for inclusion in an HTML document.
         :rtype: str or bytes
         """
+        text = self.text
+        if not self._stock_escape:
+            if url_escape:
+                return self.url_escape(text)
+            return self.html_escape(text)
+        if len(text) <= _ESCAPE_CACHE_MAX_LEN:
+            try:
+                if url_escape:
+                    return _url_escape_cached(text)
+                return _html_escape_cached(text)
+            except TypeError:
+                # Unhashable text, e.g. a bytearray
+                pass
         if url_escape:
-            return self.url_escape(self.text)
-        return self.html_escape(self.text)
+            return _url_escape(text)
+        return _html_escape(text)
 
 
 ###############################################################################
@@ -323,6 +1053,8 @@ class Document(ContainerNode, element_type=_BlockType.DOC):
 
     :param element_type: :attr:`md4c.BlockType.DOC`
     """
+    __slots__ = ()
+    _static_tags = True
 
 
 class Quote(ContainerNode, element_type=_BlockType.QUOTE):
@@ -332,6 +1064,8 @@ class Quote(ContainerNode, element_type=_BlockType.QUOTE):
 
     :param element_type: :attr:`md4c.BlockType.QUOTE`
     """
+    __slots__ = ()
+    _static_tags = True
 
     def render_pre(self, **kwargs):
         """Render the opening for this quote block.
@@ -369,6 +1103,9 @@ class UnorderedList(ContainerNode, element_type=_BlockType.UL):
 
     .. _tight: https://spec.commonmark.org/0.29/#tight
     """
+    __slots__ = ('is_tight', 'mark')
+    _static_tags = True
+
     def __init__(self, element_type, is_tight, mark, **kwargs):
         super().__init__(element_type, **kwargs)
         #: Whether the list is tight_ or not
@@ -414,6 +1151,18 @@ class OrderedList(ContainerNode, element_type=_BlockType.OL):
 
     .. _tight: https://spec.commonmark.org/0.29/#tight
     """
+    __slots__ = ('start', 'is_tight', 'mark_delimiter')
+
+    _static_close_tag = True
+
+    # Opening tags for the most common start indices. Others are formatted
+    # as needed.
+    _open_tags = {start: _sys.intern('<ol start="%d">\n' % start)
+                  for start in range(0, 21)}
+    _open_tags[1] = _sys.intern('<ol>\n')
+    _open_tags_bytes = {
+        start: tag.encode() for start, tag in _open_tags.items()}
+
     def __init__(self, element_type, start, is_tight, mark_delimiter,
                  **kwargs):
         super().__init__(element_type, **kwargs)
@@ -433,9 +1182,11 @@ class OrderedList(ContainerNode, element_type=_BlockType.OL):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        if self.start == 1:
-            return b'<ol>\n' if self.bytes else '<ol>\n'
-        else:
+        try:
+            if self.bytes:
+                return self._open_tags_bytes[self.start]
+            return self._open_tags[self.start]
+        except KeyError:
             if self.bytes:
                 return b'<ol start="%d">\n' % self.start
             else:
@@ -468,6 +1219,22 @@ class ListItem(ContainerNode, element_type=_BlockType.LI):
                              Not required if not a task list item.
     :type task_mark_offset: int, optional
     """
+    __slots__ = ('is_task', 'task_mark', 'task_mark_offset')
+
+    _static_close_tag = True
+
+    # Opening tags for task list items, keyed by task mark. None is the
+    # fallback for unchecked items.
+    _task_open_tags = {
+        None: _sys.intern('<li class="task-list-item"><input type="checkbox" '
+                          'class="task-list-item-checkbox" disabled>'),
+        'x': _sys.intern('<li class="task-list-item"><input type="checkbox" '
+                         'class="task-list-item-checkbox" disabled checked>'),
+    }
+    _task_open_tags['X'] = _task_open_tags['x']
+    _task_open_tags_bytes = {
+        mark: tag.encode() for mark, tag in _task_open_tags.items()}
+
     def __init__(self, element_type, is_task,
                  task_mark=None, task_mark_offset=None, **kwargs):
         super().__init__(element_type, **kwargs)
@@ -488,18 +1255,9 @@ class ListItem(ContainerNode, element_type=_BlockType.LI):
         :rtype: str or bytes
         """
         if self.is_task:
-            if self.task_mark in ('x', 'X'):
-                return (b'<li class="task-list-item"><input type="checkbox" '
-                        b'class="task-list-item-checkbox" disabled checked>'
-                        if self.bytes else
-                        '<li class="task-list-item"><input type="checkbox" '
-                        'class="task-list-item-checkbox" disabled checked>')
-            else:
-                return (b'<li class="task-list-item"><input type="checkbox" '
-                        b'class="task-list-item-checkbox" disabled>'
-                        if self.bytes else
-                        '<li class="task-list-item"><input type="checkbox" '
-                        'class="task-list-item-checkbox" disabled>')
+            tags = (self._task_open_tags_bytes if self.bytes
+                    else self._task_open_tags)
+            return tags.get(self.task_mark, tags[None])
         return b'<li>' if self.bytes else '<li>'
 
     def render_post(self, **kwargs):
@@ -521,6 +1279,7 @@ class HorizontalRule(ASTNode, element_type=_BlockType.HR):
 
     :param element_type: :attr:`md4c.BlockType.HR`
     """
+    __slots__ = ()
 
     def render(self, **kwargs):
         """Render this horizontal rule.
@@ -543,6 +1302,17 @@ class Heading(ContainerNode, element_type=_BlockType.H):
     :param level: Heading level (1-6)
     :type level: int
     """
+    __slots__ = ('level',)
+
+    # Tags for each heading level
+    _open_tags = {level: _sys.intern(f'<h{level}>') for level in range(1, 7)}
+    _close_tags = {
+        level: _sys.intern(f'</h{level}>\n') for level in range(1, 7)}
+    _open_tags_bytes = {
+        level: tag.encode() for level, tag in _open_tags.items()}
+    _close_tags_bytes = {
+        level: tag.encode() for level, tag in _close_tags.items()}
+
     def __init__(self, element_type, level, **kwargs):
         super().__init__(element_type, **kwargs)
         #: Heading level (1-6)
@@ -557,9 +1327,14 @@ class Heading(ContainerNode, element_type=_BlockType.H):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        if self.bytes:
-            return b'<h%d>' % self.level
-        return f'<h{self.level}>'
+        try:
+            if self.bytes:
+                return self._open_tags_bytes[self.level]
+            return self._open_tags[self.level]
+        except KeyError:
+            if self.bytes:
+                return b'<h%d>' % self.level
+            return f'<h{self.level}>'
 
     def render_post(self, **kwargs):
         """Render the closing for this heading.
@@ -570,9 +1345,14 @@ class Heading(ContainerNode, element_type=_BlockType.H):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        if self.bytes:
-            return b'</h%d>\n' % self.level
-        return f'</h{self.level}>\n'
+        try:
+            if self.bytes:
+                return self._close_tags_bytes[self.level]
+            return self._close_tags[self.level]
+        except KeyError:
+            if self.bytes:
+                return b'</h%d>\n' % self.level
+            return f'</h{self.level}>\n'
 
 
 class CodeBlock(ContainerNode, element_type=_BlockType.CODE):
@@ -588,15 +1368,53 @@ class CodeBlock(ContainerNode, element_type=_BlockType.CODE):
     :param lang: Language, if present.
     :type lang: :ref:`Attribute <attribute>` or None, optional
     """
+    __slots__ = ('fence_char', '_info', '_info_raw', '_lang', '_lang_raw',
+                 '_open_tag')
+
+    _static_close_tag = True
+
     def __init__(self, element_type, fence_char=None, info=None, lang=None,
                  **kwargs):
         super().__init__(element_type, **kwargs)
         #: Fence character, if a fenced code block. None otherwise.
         self.fence_char = fence_char
-        #: Info string, as a list of :class:`ASTNode` (if a fenced code block)
-        self.info = self.attr_to_ast(info)
-        #: Language, as a list of :class:`ASTNode` (if a fenced code block)
-        self.lang = self.attr_to_ast(lang)
+        # info and lang are only converted to lists of ASTNode if accessed.
+        # Rendering works from the parser's attributes directly.
+        self._info_raw = info
+        self._check_raw_attr(info)
+        self._info = _NOT_BUILT
+        self._lang_raw = lang
+        self._check_raw_attr(lang)
+        self._lang = _NOT_BUILT
+        self._open_tag = None
+
+    @property
+    def info(self):
+        """Info string, as a list of :class:`ASTNode` (if a fenced code block)
+        """
+        if self._info is _NOT_BUILT:
+            self._info = self.attr_to_ast(self._info_raw)
+        return self._info
+
+    @info.setter
+    def info(self, info):
+        self._info = info
+
+    @property
+    def lang(self):
+        """Language, as a list of :class:`ASTNode` (if a fenced code block)
+
+        The opening tag rendered from this is cached, so to change the
+        language, assign a new list rather than modifying this one in place.
+        """
+        if self._lang is _NOT_BUILT:
+            self._lang = self.attr_to_ast(self._lang_raw)
+        return self._lang
+
+    @lang.setter
+    def lang(self, lang):
+        self._lang = lang
+        self._open_tag = None
 
     def render_pre(self, **kwargs):
         """Render the opening for this code block.
@@ -607,13 +1425,25 @@ class CodeBlock(ContainerNode, element_type=_BlockType.CODE):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        if self.lang is None:
-            return b'<pre><code>' if self.bytes else '<pre><code>'
+        if self._open_tag is not None:
+            return self._open_tag
+        if self._lang is _NOT_BUILT:
+            lang = self._lang_raw
+            if lang is not None:
+                lang = self._render_raw_attr(lang)
+        elif self._lang is not None:
+            lang = self.render_attr(self._lang)
+        else:
+            lang = None
+        if lang is None:
+            tag = b'<pre><code>' if self.bytes else '<pre><code>'
         else:
-            lang = self.render_attr(self.lang)
             if self.bytes:
-                return b'<pre><code class="language-%b">' % lang
-            return f'<pre><code class="language-{lang}">'
+                tag = b'<pre><code class="language-%b">' % lang
+            else:
+                tag = f'<pre><code class="language-{lang}">'
+        self._open_tag = tag
+        return tag
 
     def render_post(self, **kwargs):
         """Render the closing for this heading.
@@ -634,6 +1464,8 @@ class RawHTMLBlock(ContainerNode, element_type=_BlockType.HTML):
 
     :param element_type: :attr:`md4c.BlockType.HTML`
     """
+    __slots__ = ()
+    _static_tags = True
 
 
 class Paragraph(ContainerNode, element_type=_BlockType.P):
@@ -643,6 +1475,8 @@ class Paragraph(ContainerNode, element_type=_BlockType.P):
 
     :param element_type: :attr:`md4c.BlockType.P`
     """
+    __slots__ = ()
+    _static_tags = True
 
     def render_pre(self, **kwargs):
         """Render the opening for this paragraph.
@@ -680,6 +1514,9 @@ class Table(ContainerNode, element_type=_BlockType.TABLE):
     :param body_row_count: Number of rows in the table body
     :type body_row_count: int
     """
+    __slots__ = ('col_count', 'head_row_count', 'body_row_count')
+    _static_tags = True
+
     def __init__(self, element_type,
                  col_count, head_row_count, body_row_count, **kwargs):
         super().__init__(element_type, **kwargs)
@@ -720,6 +1557,8 @@ class TableHead(ContainerNode, element_type=_BlockType.THEAD):
 
     :param element_type: :attr:`md4c.BlockType.THEAD`
     """
+    __slots__ = ()
+    _static_tags = True
 
     def render_pre(self, **kwargs):
         """Render the opening for this table heading.
@@ -751,6 +1590,8 @@ class TableBody(ContainerNode, element_type=_BlockType.TBODY):
 
     :param element_type: :attr:`md4c.BlockType.TBODY`
     """
+    __slots__ = ()
+    _static_tags = True
 
     def render_pre(self, **kwargs):
         """Render the opening for this table body.
@@ -782,6 +1623,8 @@ class TableRow(ContainerNode, element_type=_BlockType.TR):
 
     :param element_type: :attr:`md4c.BlockType.TR`
     """
+    __slots__ = ()
+    _static_tags = True
 
     def render_pre(self, **kwargs):
         """Render the opening for this table row.
@@ -815,6 +1658,19 @@ class TableHeaderCell(ContainerNode, element_type=_BlockType.TH):
     :param align: Text alignment for the cell
     :type align: :class:`md4c.Align`
     """
+    __slots__ = ('align',)
+
+    _static_close_tag = True
+
+    _open_tags = {
+        _Align.DEFAULT: _sys.intern('<th>'),
+        _Align.LEFT: _sys.intern('<th align="left">'),
+        _Align.CENTER: _sys.intern('<th align="center">'),
+        _Align.RIGHT: _sys.intern('<th align="right">'),
+    }
+    _open_tags_bytes = {
+        align: tag.encode() for align, tag in _open_tags.items()}
+
     def __init__(self, element_type, align, **kwargs):
         super().__init__(element_type, **kwargs)
         #: Text alignment for the cell (a :attr:`md4c.BlockType.TH`)
@@ -829,16 +1685,9 @@ class TableHeaderCell(ContainerNode, element_type=_BlockType.TH):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        if self.align is _Align.LEFT:
-            return b'<th align="left">' if self.bytes else '<th align="left">'
-        elif self.align is _Align.CENTER:
-            return (b'<th align="center">' if self.bytes
-                    else '<th align="center">')
-        elif self.align is _Align.RIGHT:
-            return (b'<th align="right">' if self.bytes
-                    else '<th align="right">')
-        else:
-            return b'<th>' if self.bytes else '<th>'
+        if self.bytes:
+            return self._open_tags_bytes.get(self.align, b'<th>')
+        return self._open_tags.get(self.align, '<th>')
 
     def render_post(self, **kwargs):
         """Render the closing for this table header cell.
@@ -861,6 +1710,19 @@ class TableCell(ContainerNode, element_type=_BlockType.TD):
     :param align: Text alignment for the cell
     :type align: :class:`md4c.Align`
     """
+    __slots__ = ('align',)
+
+    _static_close_tag = True
+
+    _open_tags = {
+        _Align.DEFAULT: _sys.intern('<td>'),
+        _Align.LEFT: _sys.intern('<td align="left">'),
+        _Align.CENTER: _sys.intern('<td align="center">'),
+        _Align.RIGHT: _sys.intern('<td align="right">'),
+    }
+    _open_tags_bytes = {
+        align: tag.encode() for align, tag in _open_tags.items()}
+
     def __init__(self, element_type, align, **kwargs):
         super().__init__(element_type, **kwargs)
         #: Text alignment for the cell (a :attr:`md4c.BlockType.TH`)
@@ -875,16 +1737,9 @@ class TableCell(ContainerNode, element_type=_BlockType.TD):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        if self.align is _Align.LEFT:
-            return b'<td align="left">' if self.bytes else '<td align="left">'
-        elif self.align is _Align.CENTER:
-            return (b'<td align="center">' if self.bytes
-                    else '<td align="center">')
-        elif self.align is _Align.RIGHT:
-            return (b'<td align="right">' if self.bytes
-                    else '<td align="right">')
-        else:
-            return b'<td>' if self.bytes else '<td>'
+        if self.bytes:
+            return self._open_tags_bytes.get(self.align, b'<td>')
+        return self._open_tags.get(self.align, '<td>')
 
     def render_post(self, **kwargs):
         """Render the closing for this table cell.
@@ -910,6 +1765,10 @@ class Emphasis(ContainerNode, element_type=_SpanType.EM):
 
     :param element_type: :attr:`md4c.SpanType.EM`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this emphasis inline.
@@ -953,6 +1812,10 @@ class Strong(ContainerNode, element_type=_SpanType.STRONG):
 
     :param element_type: :attr:`md4c.SpanType.STRONG`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this strong emphasis inline.
@@ -996,6 +1859,10 @@ class Underline(ContainerNode, element_type=_SpanType.U):
 
     :param element_type: :attr:`md4c.SpanType.U`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this underline inline.
@@ -1043,13 +1910,56 @@ class Link(ContainerNode, element_type=_SpanType.A):
     :param title: Link title, if present
     :type title: :ref:`Attribute <attribute>` or None, optional
     """
+    __slots__ = ('_href', '_href_raw', '_title', '_title_raw', '_open_tag')
+
+    _static_close_tag = True
+
+    _transparent_in_image = True
+
     def __init__(self, element_type, href, title=None, **kwargs):
         super().__init__(element_type, **kwargs)
-        #: Link URL, as a list of text :class:`ASTNode`
-        self.href = self.attr_to_ast(href)
-        #: Link title, as a list of text :class:`ASTNode` (or None if not
-        #: present)
-        self.title = self.attr_to_ast(title)
+        # href and title are only converted to lists of ASTNode if accessed.
+        # Rendering works from the parser's attributes directly.
+        self._href_raw = href
+        self._check_raw_attr(href)
+        self._href = _NOT_BUILT
+        self._title_raw = title
+        self._check_raw_attr(title)
+        self._title = _NOT_BUILT
+        self._open_tag = None
+
+    @property
+    def href(self):
+        """Link URL, as a list of text :class:`ASTNode`
+
+        The opening tag rendered from this is cached, so to change the URL,
+        assign a new list rather than modifying this one in place.
+        """
+        if self._href is _NOT_BUILT:
+            self._href = self.attr_to_ast(self._href_raw)
+        return self._href
+
+    @href.setter
+    def href(self, href):
+        self._href = href
+        self._open_tag = None
+
+    @property
+    def title(self):
+        """Link title, as a list of text :class:`ASTNode` (or None if not
+        present)
+
+        The opening tag rendered from this is cached, so to change the title,
+        assign a new list rather than modifying this one in place.
+        """
+        if self._title is _NOT_BUILT:
+            self._title = self.attr_to_ast(self._title_raw)
+        return self._title
+
+    @title.setter
+    def title(self, title):
+        self._title = title
+        self._open_tag = None
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this link inline.
@@ -1065,16 +1975,26 @@ class Link(ContainerNode, element_type=_SpanType.A):
         :rtype: str or bytes
         """
         if image_nesting_level == 0:
-            href = self.render_attr(self.href, url_escape=True)
-            if self.title is not None:
-                title = self.render_attr(self.title)
+            if self._open_tag is not None:
+                return self._open_tag
+            href = self._render_lazy_attr(self._href, self._href_raw,
+                                          url_escape=True)
+            title = self._title
+            if title is _NOT_BUILT:
+                title = self._title_raw
+            if title is not None:
+                title = self._render_lazy_attr(self._title, self._title_raw)
                 if self.bytes:
-                    return b'<a href="%b" title="%b">' % (href, title)
-                return f'<a href="{href}" title="{title}">'
+                    tag = b'<a href="%b" title="%b">' % (href, title)
+                else:
+                    tag = f'<a href="{href}" title="{title}">'
             else:
                 if self.bytes:
-                    return b'<a href="%b">' % href
-                return f'<a href="{href}">'
+                    tag = b'<a href="%b">' % href
+                else:
+                    tag = f'<a href="{href}">'
+            self._open_tag = tag
+            return tag
         return b'' if self.bytes else ''
 
     def render_post(self, image_nesting_level=0, **kwargs):
@@ -1106,12 +2026,55 @@ class Image(ContainerNode, element_type=_SpanType.IMG):
     :param title: Image title, if present
     :type title: :ref:`Attribute <attribute>` or None, optional
     """
+    __slots__ = ('_src', '_src_raw', '_title', '_title_raw', '_open_tag',
+                 '_close_tag')
+
+    _render_kind = _RENDER_IMAGE
+
     def __init__(self, element_type, src, title=None, **kwargs):
         super().__init__(element_type, **kwargs)
-        #: Image URL, as a list of :class:`ASTNode`
-        self.src = self.attr_to_ast(src)
-        #: Image title, as a list of :class:`ASTNode` (or None if not present)
-        self.title = self.attr_to_ast(title)
+        # src and title are only converted to lists of ASTNode if accessed.
+        # Rendering works from the parser's attributes directly.
+        self._src_raw = src
+        self._check_raw_attr(src)
+        self._src = _NOT_BUILT
+        self._title_raw = title
+        self._check_raw_attr(title)
+        self._title = _NOT_BUILT
+        self._open_tag = None
+        self._close_tag = None
+
+    @property
+    def src(self):
+        """Image URL, as a list of :class:`ASTNode`
+
+        The tag rendered from this is cached, so to change the URL, assign a
+        new list rather than modifying this one in place.
+        """
+        if self._src is _NOT_BUILT:
+            self._src = self.attr_to_ast(self._src_raw)
+        return self._src
+
+    @src.setter
+    def src(self, src):
+        self._src = src
+        self._open_tag = None
+
+    @property
+    def title(self):
+        """Image title, as a list of :class:`ASTNode` (or None if not present)
+
+        The tag rendered from this is cached, so to change the title, assign a
+        new list rather than modifying this one in place.
+        """
+        if self._title is _NOT_BUILT:
+            self._title = self.attr_to_ast(self._title_raw)
+        return self._title
+
+    @title.setter
+    def title(self, title):
+        self._title = title
+        self._close_tag = None
 
     def render_pre(self, image_nesting_level, **kwargs):
         """Render the opening for this image inline.
@@ -1127,10 +2090,16 @@ class Image(ContainerNode, element_type=_SpanType.IMG):
         :rtype: str or bytes
         """
         if image_nesting_level == 1:
-            src = self.render_attr(self.src, url_escape=True)
+            if self._open_tag is not None:
+                return self._open_tag
+            src = self._render_lazy_attr(self._src, self._src_raw,
+                                         url_escape=True)
             if self.bytes:
-                return b'<img src="%b" alt="' % src
-            return f'<img src="{src}" alt="'
+                tag = b'<img src="%b" alt="' % src
+            else:
+                tag = f'<img src="{src}" alt="'
+            self._open_tag = tag
+            return tag
         return b'' if self.bytes else ''
 
     def render_post(self, image_nesting_level, **kwargs):
@@ -1147,13 +2116,21 @@ class Image(ContainerNode, element_type=_SpanType.IMG):
         :rtype: str or bytes
         """
         if image_nesting_level == 1:
-            if self.title is not None:
-                title = self.render_attr(self.title)
+            if self._close_tag is not None:
+                return self._close_tag
+            title = self._title
+            if title is _NOT_BUILT:
+                title = self._title_raw
+            if title is not None:
+                title = self._render_lazy_attr(self._title, self._title_raw)
                 if self.bytes:
-                    return b'" title="%b">' % title
-                return f'" title="{title}">'
+                    tag = b'" title="%b">' % title
+                else:
+                    tag = f'" title="{title}">'
             else:
-                return b'">' if self.bytes else '">'
+                tag = b'">' if self.bytes else '">'
+            self._close_tag = tag
+            return tag
         return b'' if self.bytes else ''
 
     def render(self, image_nesting_level=0, **kwargs):
@@ -1168,9 +2145,13 @@ class Image(ContainerNode, element_type=_SpanType.IMG):
         :returns: Rendered HTML
         :rtype: str or bytes
         """
-        image_nesting_level += 1
-        return super().render(image_nesting_level=image_nesting_level,
-                              **kwargs)
+        kwargs['image_nesting_level'] = image_nesting_level
+        renderings = []
+        _render_tree_into(self, renderings, kwargs, _RENDER_IMAGE)
+        return b''.join(renderings) if self.bytes else ''.join(renderings)
+
+    def _render_into(self, out, kwargs):
+        _render_tree_into(self, out, kwargs, _RENDER_IMAGE)
 
 
 class Code(ContainerNode, element_type=_SpanType.CODE):
@@ -1180,6 +2161,10 @@ class Code(ContainerNode, element_type=_SpanType.CODE):
 
     :param element_type: :attr:`md4c.SpanType.CODE`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this code inline.
@@ -1223,6 +2208,10 @@ class Strikethrough(ContainerNode, element_type=_SpanType.DEL):
 
     :param element_type: :attr:`md4c.SpanType.DEL`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this strikethrough inline.
@@ -1266,6 +2255,10 @@ class InlineMath(ContainerNode, element_type=_SpanType.LATEXMATH):
 
     :param element_type: :attr:`md4c.SpanType.LATEXMATH`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this inline math.
@@ -1309,6 +2302,10 @@ class DisplayMath(ContainerNode, element_type=_SpanType.LATEXMATH_DISPLAY):
 
     :param element_type: :attr:`md4c.SpanType.LATEXMATH_DISPLAY`
     """
+    __slots__ = ()
+
+    _transparent_in_image = True
+    _static_tags = True
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this display math.
@@ -1355,10 +2352,36 @@ class WikiLink(ContainerNode, element_type=_SpanType.WIKILINK):
     :param target: Link target
     :type target: :ref:`Attribute <attribute>`
     """
+    __slots__ = ('_target', '_target_raw', '_open_tag')
+
+    _static_close_tag = True
+
+    _transparent_in_image = True
+
     def __init__(self, element_type, target, **kwargs):
         super().__init__(element_type, **kwargs)
-        #: Link target, as a list of :class:`ASTNode`
-        self.target = self.attr_to_ast(target)
+        # target is only converted to a list of ASTNode if accessed.
+        # Rendering works from the parser's attribute directly.
+        self._target_raw = target
+        self._check_raw_attr(target)
+        self._target = _NOT_BUILT
+        self._open_tag = None
+
+    @property
+    def target(self):
+        """Link target, as a list of :class:`ASTNode`
+
+        The opening tag rendered from this is cached, so to change the target,
+        assign a new list rather than modifying this one in place.
+        """
+        if self._target is _NOT_BUILT:
+            self._target = self.attr_to_ast(self._target_raw)
+        return self._target
+
+    @target.setter
+    def target(self, target):
+        self._target = target
+        self._open_tag = None
 
     def render_pre(self, image_nesting_level=0, **kwargs):
         """Render the opening for this wiki link inline.
@@ -1374,10 +2397,15 @@ class WikiLink(ContainerNode, element_type=_SpanType.WIKILINK):
         :rtype: str or bytes
         """
         if image_nesting_level == 0:
-            target = self.render_attr(self.target)
+            if self._open_tag is not None:
+                return self._open_tag
+            target = self._render_lazy_attr(self._target, self._target_raw)
             if self.bytes:
-                return b'<x-wikilink data-target="%b">' % target
-            return f'<x-wikilink data-target="{target}">'
+                tag = b'<x-wikilink data-target="%b">' % target
+            else:
+                tag = f'<x-wikilink data-target="{target}">'
+            self._open_tag = tag
+            return tag
         return b'' if self.bytes else ''
 
     def render_post(self, image_nesting_level=0, **kwargs):
@@ -1412,6 +2440,7 @@ class NormalText(TextNode, element_type=_TextType.NORMAL):
     :param text: The actual text
     :type text: str or bytes
     """
+    __slots__ = ()
 
 
 class NullChar(TextNode, element_type=_TextType.NULLCHAR):
@@ -1424,6 +2453,8 @@ class NullChar(TextNode, element_type=_TextType.NULLCHAR):
                  ignores it.
     :type text: str or bytes
     """
+    __slots__ = ()
+    _static_text = True
 
     def render(self, **kwargs):
         """Render this null character (as the Unicode replacement character,
@@ -1450,6 +2481,8 @@ class LineBreak(TextNode, element_type=_TextType.BR):
                  and ignores it.
     :type text: str or bytes
     """
+    __slots__ = ()
+    _static_text = True
 
     def render(self, image_nesting_level=0, **kwargs):
         """Render this line break.
@@ -1482,6 +2515,8 @@ class SoftLineBreak(TextNode, element_type=_TextType.SOFTBR):
                  and ignores it.
     :type text: str or bytes
     """
+    __slots__ = ()
+    _static_text = True
 
     def render(self, image_nesting_level=0, **kwargs):
         """Render this soft line break.
@@ -1513,6 +2548,9 @@ class HTMLEntity(TextNode, element_type=_TextType.ENTITY):
     :param text: The entity, including ampersand and semicolon
     :type text: str or bytes
     """
+    __slots__ = ()
+
+    _render_kind = _RENDER_ENTITY
 
     def render(self, url_escape=False, **kwargs):
         """Render this HTML entity.
@@ -1527,15 +2565,16 @@ class HTMLEntity(TextNode, element_type=_TextType.ENTITY):
         :returns: Corresponding UTF-8 text for the entity.
         :rtype: str or bytes
         """
-        entity = _lookup_entity(self.text)
-        if isinstance(entity, str):
-            # Need to check for null characters in case the entity was '&#0;'
-            entity = entity.replace('\x00', '\ufffd')
-            if isinstance(self.text, _ByteString):
-                entity = entity.encode()
-        if url_escape:
-            return self.url_escape(entity)
-        return self.html_escape(entity)
+        text = self.text
+        if not self._stock_escape:
+            entity = _translate_entity(text)
+            if url_escape:
+                return self.url_escape(entity)
+            return self.html_escape(entity)
+        if isinstance(text, bytearray):
+            # Unhashable, so it cannot go through the cache
+            text = bytes(text)
+        return _render_entity(text, bool(url_escape))
 
 
 class CodeText(TextNode, element_type=_TextType.CODE):
@@ -1547,6 +2586,7 @@ class CodeText(TextNode, element_type=_TextType.CODE):
     :param text: The actual code
     :type text: str or bytes
     """
+    __slots__ = ()
 
 
 class HTMLText(TextNode, element_type=_TextType.HTML):
@@ -1558,6 +2598,9 @@ class HTMLText(TextNode, element_type=_TextType.HTML):
     :param text: The raw HTML
     :type text: str or bytes
     """
+    __slots__ = ()
+
+    _render_kind = _RENDER_RAW_TEXT
 
     def render(self, **kwargs):
         """Render this HTML text.
@@ -1580,3 +2623,4 @@ class MathText(TextNode, element_type=_TextType.LATEXMATH):
     :param text: The actual text
     :type text: str or bytes
     """
+    __slots__ = ()
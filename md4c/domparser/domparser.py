@@ -27,7 +27,7 @@
 
 import collections.abc
 from ..parser import ParserObject
-from .ast import ASTNode
+from .ast import _new_container, _new_text
 
 
 class DOMParser(ParserObject):
@@ -52,6 +52,13 @@ class DOMParser(ParserObject):
     __ whyfast_
     """
 
+    __slots__ = ('root', '_current', '_use_bytes')
+
+    def __init__(self, *args, **kwargs):
+        if kwargs.get('fast_enums'):
+            raise ValueError("DOMParser does not support fast_enums")
+        super().__init__(*args, **kwargs)
+
     def enter_block(self, block_type, details):
         """Enter block callback. Creates a new ASTNode for the block and add
         it to the AST.
@@ -60,7 +67,7 @@ class DOMParser(ParserObject):
                            representing the type of block being entered
         :param details: A dict containing details about the block
         """
-        block = ASTNode(block_type, use_bytes=self._use_bytes, **details)
+        block = _new_container(block_type, self._use_bytes, details)
         if self.root is None:
             self.root = block
             self._current = block
@@ -86,7 +93,7 @@ class DOMParser(ParserObject):
                            representing the type of span being entered
         :param details: A dict containing details about the span
         """
-        span = ASTNode(span_type, use_bytes=self._use_bytes, **details)
+        span = _new_container(span_type, self._use_bytes, details)
         self._current.append(span)
         self._current = span
 
@@ -108,8 +115,7 @@ class DOMParser(ParserObject):
                           representing the type of span being entered
         :param text: The actual text to be added
         """
-        text_element = ASTNode(text_type, use_bytes=self._use_bytes, text=text)
-        self._current.append(text_element)
+        self._current.append(_new_text(text_type, text, self._use_bytes))
 
     def parse(self, markdown):
         """Produce an AST from the given Markdown document.
@@ -25,139 +25,6 @@
 # IN THE SOFTWARE.
 #
 
-from enum import Enum
-
-from . import _enum_consts
-
-
-# NOTE When adding a new element to any of these Enums, make sure to add an
-# appropriate class to domparser/domtypes.py.
-
-class BlockType(Enum):
-    """Represents a type of Markdown block"""
-
-    #: Document
-    DOC = _enum_consts.MD_BLOCK_DOC
-
-    #: Block quote
-    QUOTE = _enum_consts.MD_BLOCK_QUOTE
-
-    #: Unordered list
-    UL = _enum_consts.MD_BLOCK_UL
-
-    #: Ordered list
-    OL = _enum_consts.MD_BLOCK_OL
-
-    #: List item
-    LI = _enum_consts.MD_BLOCK_LI
-
-    #: Horizontal rule
-    HR = _enum_consts.MD_BLOCK_HR
-
-    #: Heading
-    H = _enum_consts.MD_BLOCK_H
-
-    #: Code block
-    CODE = _enum_consts.MD_BLOCK_CODE
-
-    #: Raw HTML block
-    HTML = _enum_consts.MD_BLOCK_HTML
-
-    #: Paragraph
-    P = _enum_consts.MD_BLOCK_P
-
-    #: Table
-    TABLE = _enum_consts.MD_BLOCK_TABLE
-
-    #: Table header row
-    THEAD = _enum_consts.MD_BLOCK_THEAD
-
-    #: Table body
-    TBODY = _enum_consts.MD_BLOCK_TBODY
-
-    #: Table row
-    TR = _enum_consts.MD_BLOCK_TR
-
-    #: Table header cell
-    TH = _enum_consts.MD_BLOCK_TH
-
-    #: Table cell
-    TD = _enum_consts.MD_BLOCK_TD
-
-
-class SpanType(Enum):
-    """Represents a type of Markdown span/inline"""
-
-    #: Emphasis
-    EM = _enum_consts.MD_SPAN_EM
-
-    #: Strong emphasis
-    STRONG = _enum_consts.MD_SPAN_STRONG
-
-    #: Link
-    A = _enum_consts.MD_SPAN_A
-
-    #: Image
-    IMG = _enum_consts.MD_SPAN_IMG
-
-    #: Inline code
-    CODE = _enum_consts.MD_SPAN_CODE
-
-    #: Strikethrough
-    DEL = _enum_consts.MD_SPAN_DEL
-
-    #: Inline math
-    LATEXMATH = _enum_consts.MD_SPAN_LATEXMATH
-
-    #: Display math
-    LATEXMATH_DISPLAY = _enum_consts.MD_SPAN_LATEXMATH_DISPLAY
-
-    #: Wiki link
-    WIKILINK = _enum_consts.MD_SPAN_WIKILINK
-
-    #: Underline
-    U = _enum_consts.MD_SPAN_U
-
-
-class TextType(Enum):
-    """Represents a type of Markdown text"""
-
-    #: Normal text
-    NORMAL = _enum_consts.MD_TEXT_NORMAL
-
-    #: Null character
-    NULLCHAR = _enum_consts.MD_TEXT_NULLCHAR
-
-    #: Line break
-    BR = _enum_consts.MD_TEXT_BR
-
-    #: Soft line break
-    SOFTBR = _enum_consts.MD_TEXT_SOFTBR
-
-    #: HTML entity
-    ENTITY = _enum_consts.MD_TEXT_ENTITY
-
-    #: Text inside a code block or inline code block
-    CODE = _enum_consts.MD_TEXT_CODE
-
-    #: Raw HTML (inside an HTML block or simply inline HTML)
-    HTML = _enum_consts.MD_TEXT_HTML
-
-    #: Text inside an equation
-    LATEXMATH = _enum_consts.MD_TEXT_LATEXMATH
-
-
-class Align(Enum):
-    """Represents a table cell alignment"""
-
-    #: Default alignment
-    DEFAULT = _enum_consts.MD_ALIGN_DEFAULT
-
-    #: Left alignment
-    LEFT = _enum_consts.MD_ALIGN_LEFT
-
-    #: Centering
-    CENTER = _enum_consts.MD_ALIGN_CENTER
-
-    #: Right alignment
-    RIGHT = _enum_consts.MD_ALIGN_RIGHT
+# The enum types are built by the C extension at import time. See
+# src/enum_consts.c for their members.
+from ._md4c import BlockType, SpanType, TextType, Align  # noqa: F401
@@ -0,0 +1,70 @@
+#
+# PyMD4C
+# Python bindings for MD4C
+#
+# md4c.fast_consts - Plain integer constants for GenericParser(fast_enums=True)
+#
+# Copyright (c) 2020-2021 Dominick C. Pastore
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+
+from . import _md4c as _c
+
+BLOCK_DOC = _c.MD_BLOCK_DOC
+BLOCK_QUOTE = _c.MD_BLOCK_QUOTE
+BLOCK_UL = _c.MD_BLOCK_UL
+BLOCK_OL = _c.MD_BLOCK_OL
+BLOCK_LI = _c.MD_BLOCK_LI
+BLOCK_HR = _c.MD_BLOCK_HR
+BLOCK_H = _c.MD_BLOCK_H
+BLOCK_CODE = _c.MD_BLOCK_CODE
+BLOCK_HTML = _c.MD_BLOCK_HTML
+BLOCK_P = _c.MD_BLOCK_P
+BLOCK_TABLE = _c.MD_BLOCK_TABLE
+BLOCK_THEAD = _c.MD_BLOCK_THEAD
+BLOCK_TBODY = _c.MD_BLOCK_TBODY
+BLOCK_TR = _c.MD_BLOCK_TR
+BLOCK_TH = _c.MD_BLOCK_TH
+BLOCK_TD = _c.MD_BLOCK_TD
+
+SPAN_EM = _c.MD_SPAN_EM
+SPAN_STRONG = _c.MD_SPAN_STRONG
+SPAN_A = _c.MD_SPAN_A
+SPAN_IMG = _c.MD_SPAN_IMG
+SPAN_CODE = _c.MD_SPAN_CODE
+SPAN_DEL = _c.MD_SPAN_DEL
+SPAN_LATEXMATH = _c.MD_SPAN_LATEXMATH
+SPAN_LATEXMATH_DISPLAY = _c.MD_SPAN_LATEXMATH_DISPLAY
+SPAN_WIKILINK = _c.MD_SPAN_WIKILINK
+SPAN_U = _c.MD_SPAN_U
+
+TEXT_NORMAL = _c.MD_TEXT_NORMAL
+TEXT_NULLCHAR = _c.MD_TEXT_NULLCHAR
+TEXT_BR = _c.MD_TEXT_BR
+TEXT_SOFTBR = _c.MD_TEXT_SOFTBR
+TEXT_ENTITY = _c.MD_TEXT_ENTITY
+TEXT_CODE = _c.MD_TEXT_CODE
+TEXT_HTML = _c.MD_TEXT_HTML
+TEXT_LATEXMATH = _c.MD_TEXT_LATEXMATH
+
+ALIGN_DEFAULT = _c.MD_ALIGN_DEFAULT
+ALIGN_LEFT = _c.MD_ALIGN_LEFT
+ALIGN_CENTER = _c.MD_ALIGN_CENTER
+ALIGN_RIGHT = _c.MD_ALIGN_RIGHT
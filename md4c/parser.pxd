@@ -0,0 +1,39 @@
+#
+# PyMD4C
+# Python bindings for MD4C
+#
+# md4c/parser.pxd - Cython declarations augmenting md4c/parser.py
+#
+# Copyright (c) 2020-2021 Dominick C. Pastore
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+
+# This file is only used when parser.py is compiled with Cython (see
+# setup.py). parser.py remains plain Python and works without it.
+
+cdef class ParserObject:
+    cdef public object parser
+
+    cpdef enter_block(self, block_type, details)
+    cpdef leave_block(self, block_type, details)
+    cpdef enter_span(self, span_type, details)
+    cpdef leave_span(self, span_type, details)
+    cpdef text(self, text_type, text)
+    cpdef parse(self, markdown)
@@ -42,6 +42,9 @@ class ParserObject:
     as-is to set parser options.
     """
 
+    # When compiled with Cython, parser.pxd declares the attributes instead
+    __slots__ = ('parser',)
+
     def __init__(self, *args, **kwargs):
         self.parser = GenericParser(*args, **kwargs)
 
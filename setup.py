@@ -1,3 +1,4 @@
+import os
 import sys
 from setuptools import setup, Extension
 import json
@@ -25,6 +26,11 @@ class PkgconfigExtensionList(list):
     def _fetch_pkgconfig(self, extension):
         """Convert the pkgconfig keys in the dict to the proper arguments for
         Extension and then create the actual Extension"""
+        # Already-built Extension objects (e.g. from cythonize()) are added
+        # as-is
+        if not isinstance(extension, dict):
+            return extension
+
         # If no 'pkgconfig' key, add as-is
         try:
             libs = extension['pkgconfig']
@@ -67,7 +73,6 @@ class PkgconfigExtensionList(list):
 
 
 if sys.platform.startswith('win'):
-    import os
     import os.path
 
     md4c_path = os.environ.get('MD4C_PATH', 'C:/Program Files (x86)/MD4C')
@@ -81,16 +86,11 @@ if sys.platform.startswith('win'):
                 'src/pymd4c.c',
                 'src/generic_parser.c',
                 'src/html_renderer.c',
+                'src/enum_consts.c',
             ],
             include_dirs=[md4c_include],
             libraries=['md4c', 'md4c-html'],
             library_dirs=[md4c_lib]),
-        Extension(
-            'md4c._enum_consts',
-            sources=['src/enum_consts.c'],
-            include_dirs=[md4c_include],
-            libraries=['md4c'],
-            library_dirs=[md4c_lib]),
     ]
 else:
     extensions = PkgconfigExtensionList([
@@ -100,20 +100,29 @@ else:
                 'src/pymd4c.c',
                 'src/generic_parser.c',
                 'src/html_renderer.c',
-            ],
-            'pkgconfig': 'md4c md4c-html',
-            'include_dirs': ['src'],
-        },
-        {
-            'name': 'md4c._enum_consts',
-            'sources': [
                 'src/enum_consts.c',
             ],
-            'pkgconfig': 'md4c',
+            'pkgconfig': 'md4c md4c-html',
             'include_dirs': ['src'],
         },
     ])
 
+# Pure Python modules that are also compiled with Cython when it is available,
+# for speed. The .py files are always installed, so everything still works
+# without Cython. Set PYMD4C_CYTHON=0 to skip compiling them.
+cython_modules = [
+    'md4c/parser.py',
+    'md4c/domparser/ast.py',
+]
+
+if os.environ.get('PYMD4C_CYTHON', '1') != '0':
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        pass
+    else:
+        extensions.extend(cythonize(cython_modules, language_level=3))
+
 setup(
     # Most package metadata is in about.json (added below via **about)
     long_description=long_description,
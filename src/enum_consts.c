@@ -2,10 +2,10 @@
  * PyMD4C
  * Python bindings for MD4C
  *
- * enum_consts.c - md4c._enum_consts module
- * Python bindings for the various enum constants for MD4C. These are not
- * intended for direct use by applications--they should use the Python enums
- * instead
+ * enum_consts.c - Enum constants and types for the md4c._md4c module
+ * Python bindings for the various enum constants for MD4C, along with the
+ * Python enum types built from them. The constants are not intended for
+ * direct use by applications--they should use the Python enums instead
  *
  * Copyright (c) 2020 Dominick C. Pastore
  *
@@ -33,229 +33,351 @@
 
 #include <md4c.h>
 
+#include "enum_consts.h"
+
 /*
- * Add MD_BLOCKTYPE enum constants
+ * The Python enum types and their member lookup tuples, set by
+ * md4c_add_enums()
  */
-int add_blocktype_consts(PyObject *m) {
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_DOC",
-                MD_BLOCK_DOC) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_QUOTE",
-                MD_BLOCK_QUOTE) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_UL",
-                MD_BLOCK_UL) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_OL",
-                MD_BLOCK_OL) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_LI",
-                MD_BLOCK_LI) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_HR",
-                MD_BLOCK_HR) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_H",
-                MD_BLOCK_H) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_CODE",
-                MD_BLOCK_CODE) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_HTML",
-                MD_BLOCK_HTML) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_P",
-                MD_BLOCK_P) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_TABLE",
-                MD_BLOCK_TABLE) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_THEAD",
-                MD_BLOCK_THEAD) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_TBODY",
-                MD_BLOCK_TBODY) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_TR",
-                MD_BLOCK_TR) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_TH",
-                MD_BLOCK_TH) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_BLOCK_TD",
-                MD_BLOCK_TD) < 0) {
-        return -1;
+PyObject *BlockTypeEnum;
+PyObject *SpanTypeEnum;
+PyObject *TextTypeEnum;
+PyObject *AlignEnum;
+PyObject *BlockTypeMembers;
+PyObject *SpanTypeMembers;
+PyObject *TextTypeMembers;
+PyObject *AlignMembers;
+
+/******************************************************************************
+ * Enum tables                                                                *
+ ******************************************************************************/
+
+// NOTE When adding a new member to any of these tables, make sure to add an
+// appropriate class to domparser/ast.py.
+
+/*
+ * A single enum member: its name (without the MD_*_ prefix) and value. Each
+ * table below is used both for the MD_* integer constants and for the members
+ * of the corresponding Python enum type.
+ */
+typedef struct {
+    const char *name;
+    int value;
+} EnumMember;
+
+static const EnumMember blocktype_members[] = {
+    {"DOC", MD_BLOCK_DOC},
+    {"QUOTE", MD_BLOCK_QUOTE},
+    {"UL", MD_BLOCK_UL},
+    {"OL", MD_BLOCK_OL},
+    {"LI", MD_BLOCK_LI},
+    {"HR", MD_BLOCK_HR},
+    {"H", MD_BLOCK_H},
+    {"CODE", MD_BLOCK_CODE},
+    {"HTML", MD_BLOCK_HTML},
+    {"P", MD_BLOCK_P},
+    {"TABLE", MD_BLOCK_TABLE},
+    {"THEAD", MD_BLOCK_THEAD},
+    {"TBODY", MD_BLOCK_TBODY},
+    {"TR", MD_BLOCK_TR},
+    {"TH", MD_BLOCK_TH},
+    {"TD", MD_BLOCK_TD},
+    {NULL, 0},
+};
+
+static const char blocktype_doc[] =
+    "Represents a type of Markdown block\n"
+    "\n"
+    ":cvar DOC: Document\n"
+    ":cvar QUOTE: Block quote\n"
+    ":cvar UL: Unordered list\n"
+    ":cvar OL: Ordered list\n"
+    ":cvar LI: List item\n"
+    ":cvar HR: Horizontal rule\n"
+    ":cvar H: Heading\n"
+    ":cvar CODE: Code block\n"
+    ":cvar HTML: Raw HTML block\n"
+    ":cvar P: Paragraph\n"
+    ":cvar TABLE: Table\n"
+    ":cvar THEAD: Table header row\n"
+    ":cvar TBODY: Table body\n"
+    ":cvar TR: Table row\n"
+    ":cvar TH: Table header cell\n"
+    ":cvar TD: Table cell\n";
+
+static const EnumMember spantype_members[] = {
+    {"EM", MD_SPAN_EM},
+    {"STRONG", MD_SPAN_STRONG},
+    {"A", MD_SPAN_A},
+    {"IMG", MD_SPAN_IMG},
+    {"CODE", MD_SPAN_CODE},
+    {"DEL", MD_SPAN_DEL},
+    {"LATEXMATH", MD_SPAN_LATEXMATH},
+    {"LATEXMATH_DISPLAY", MD_SPAN_LATEXMATH_DISPLAY},
+    {"WIKILINK", MD_SPAN_WIKILINK},
+    {"U", MD_SPAN_U},
+    {NULL, 0},
+};
+
+static const char spantype_doc[] =
+    "Represents a type of Markdown span/inline\n"
+    "\n"
+    ":cvar EM: Emphasis\n"
+    ":cvar STRONG: Strong emphasis\n"
+    ":cvar A: Link\n"
+    ":cvar IMG: Image\n"
+    ":cvar CODE: Inline code\n"
+    ":cvar DEL: Strikethrough\n"
+    ":cvar LATEXMATH: Inline math\n"
+    ":cvar LATEXMATH_DISPLAY: Display math\n"
+    ":cvar WIKILINK: Wiki link\n"
+    ":cvar U: Underline\n";
+
+static const EnumMember texttype_members[] = {
+    {"NORMAL", MD_TEXT_NORMAL},
+    {"NULLCHAR", MD_TEXT_NULLCHAR},
+    {"BR", MD_TEXT_BR},
+    {"SOFTBR", MD_TEXT_SOFTBR},
+    {"ENTITY", MD_TEXT_ENTITY},
+    {"CODE", MD_TEXT_CODE},
+    {"HTML", MD_TEXT_HTML},
+    {"LATEXMATH", MD_TEXT_LATEXMATH},
+    {NULL, 0},
+};
+
+static const char texttype_doc[] =
+    "Represents a type of Markdown text\n"
+    "\n"
+    ":cvar NORMAL: Normal text\n"
+    ":cvar NULLCHAR: Null character\n"
+    ":cvar BR: Line break\n"
+    ":cvar SOFTBR: Soft line break\n"
+    ":cvar ENTITY: HTML entity\n"
+    ":cvar CODE: Text inside a code block or inline code block\n"
+    ":cvar HTML: Raw HTML (inside an HTML block or simply inline HTML)\n"
+    ":cvar LATEXMATH: Text inside an equation\n";
+
+static const EnumMember align_members[] = {
+    {"DEFAULT", MD_ALIGN_DEFAULT},
+    {"LEFT", MD_ALIGN_LEFT},
+    {"CENTER", MD_ALIGN_CENTER},
+    {"RIGHT", MD_ALIGN_RIGHT},
+    {NULL, 0},
+};
+
+static const char align_doc[] =
+    "Represents a table cell alignment\n"
+    "\n"
+    ":cvar DEFAULT: Default alignment\n"
+    ":cvar LEFT: Left alignment\n"
+    ":cvar CENTER: Centering\n"
+    ":cvar RIGHT: Right alignment\n";
+
+/******************************************************************************
+ * Enum constants                                                             *
+ ******************************************************************************/
+
+/*
+ * Add an integer constant named prefix + member name for each member of the
+ * table. Return 0 on success or -1 on failure.
+ */
+static int add_consts(PyObject *m, const char *prefix,
+        const EnumMember *members) {
+    char name[64];
+    for (const EnumMember *member = members; member->name != NULL; member++) {
+        PyOS_snprintf(name, sizeof(name), "%s%s", prefix, member->name);
+        if (PyModule_AddIntConstant(m, name, member->value) < 0) {
+            return -1;
+        }
     }
     return 0;
 }
 
+/******************************************************************************
+ * Python enum types                                                          *
+ ******************************************************************************/
+
 /*
- * Add MD_SPANTYPE enum constants
+ * Create a Python enum type using the functional API of enum.Enum, i.e.
+ * Enum(name, ((member_name, value), ...), module='md4c.enums'), set its
+ * docstring, and add it to the module. A new reference to the type is also
+ * stored in *enum_out, and a tuple mapping each value to its member (None for
+ * unused values) in *members_out. Return 0 on success or -1 on failure.
  */
-int add_spantype_consts(PyObject *m) {
-    if (PyModule_AddIntConstant(m, "MD_SPAN_EM",
-                MD_SPAN_EM) < 0) {
-        return -1;
+static int add_enum(PyObject *m, PyObject *enum_base, const char *name,
+        const char *doc, const EnumMember *members, PyObject **enum_out,
+        PyObject **members_out) {
+    // Build the ((member_name, value), ...) tuple in one go
+    Py_ssize_t count = 0;
+    while (members[count].name != NULL) {
+        count++;
+    }
+    PyObject *member_tuple = PyTuple_New(count);
+    if (member_tuple == NULL) {
+        return -1;
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        PyObject *item = Py_BuildValue("(si)", members[i].name,
+                members[i].value);
+        if (item == NULL) {
+            Py_DECREF(member_tuple);
+            return -1;
+        }
+        PyTuple_SET_ITEM(member_tuple, i, item);
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_STRONG",
-                MD_SPAN_STRONG) < 0) {
+
+    PyObject *args = Py_BuildValue("(sN)", name, member_tuple);
+    if (args == NULL) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_A",
-                MD_SPAN_A) < 0) {
+    PyObject *kwds = Py_BuildValue("{ss}", "module", "md4c.enums");
+    if (kwds == NULL) {
+        Py_DECREF(args);
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_IMG",
-                MD_SPAN_IMG) < 0) {
+    PyObject *enum_type = PyObject_Call(enum_base, args, kwds);
+    Py_DECREF(args);
+    Py_DECREF(kwds);
+    if (enum_type == NULL) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_CODE",
-                MD_SPAN_CODE) < 0) {
+
+    PyObject *doc_obj = PyUnicode_FromString(doc);
+    if (doc_obj == NULL) {
+        Py_DECREF(enum_type);
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_DEL",
-                MD_SPAN_DEL) < 0) {
+    if (PyObject_SetAttrString(enum_type, "__doc__", doc_obj) < 0) {
+        Py_DECREF(doc_obj);
+        Py_DECREF(enum_type);
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_LATEXMATH",
-                MD_SPAN_LATEXMATH) < 0) {
+    Py_DECREF(doc_obj);
+
+    // Enum hashes members by name in Python code. Members are singletons and
+    // compare by identity, so the identity hash from object is equivalent,
+    // and it keeps dict lookups keyed on members in C.
+    PyObject *object_hash = PyObject_GetAttrString(
+            (PyObject *) &PyBaseObject_Type, "__hash__");
+    if (object_hash == NULL) {
+        Py_DECREF(enum_type);
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_LATEXMATH_DISPLAY",
-                MD_SPAN_LATEXMATH_DISPLAY) < 0) {
+    if (PyObject_SetAttrString(enum_type, "__hash__", object_hash) < 0) {
+        Py_DECREF(object_hash);
+        Py_DECREF(enum_type);
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_WIKILINK",
-                MD_SPAN_WIKILINK) < 0) {
-        return -1;
+    Py_DECREF(object_hash);
+
+    // Build the value -> member lookup tuple, so the parser callbacks can
+    // fetch members without calling the enum type
+    int max_value = 0;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (members[i].value > max_value) {
+            max_value = members[i].value;
+        }
+    }
+    PyObject *lookup = PyTuple_New(max_value + 1);
+    if (lookup == NULL) {
+        Py_DECREF(enum_type);
+        return -1;
+    }
+    for (Py_ssize_t i = 0; i <= max_value; i++) {
+        Py_INCREF(Py_None);
+        PyTuple_SET_ITEM(lookup, i, Py_None);
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (members[i].value < 0) {
+            continue;
+        }
+        PyObject *member = PyObject_GetAttrString(enum_type, members[i].name);
+        if (member == NULL) {
+            Py_DECREF(lookup);
+            Py_DECREF(enum_type);
+            return -1;
+        }
+        Py_DECREF(PyTuple_GET_ITEM(lookup, members[i].value));
+        PyTuple_SET_ITEM(lookup, members[i].value, member);
     }
-    if (PyModule_AddIntConstant(m, "MD_SPAN_U",
-                MD_SPAN_U) < 0) {
+
+    Py_INCREF(enum_type);
+    if (PyModule_AddObject(m, name, enum_type) < 0) {
+        Py_DECREF(lookup);
+        Py_DECREF(enum_type);
+        Py_DECREF(enum_type);
         return -1;
     }
+    *enum_out = enum_type;
+    *members_out = lookup;
     return 0;
 }
 
 /*
- * Add MD_TEXTTYPE enum constants
+ * Add the BlockType, SpanType, TextType, and Align enum types
  */
-int add_texttype_consts(PyObject *m) {
-    if (PyModule_AddIntConstant(m, "MD_TEXT_NORMAL",
-                MD_TEXT_NORMAL) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_NULLCHAR",
-                MD_TEXT_NULLCHAR) < 0) {
-        return -1;
-    }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_BR",
-                MD_TEXT_BR) < 0) {
+static int add_enums(PyObject *m) {
+    PyObject *enum_module = PyImport_ImportModule("enum");
+    if (enum_module == NULL) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_SOFTBR",
-                MD_TEXT_SOFTBR) < 0) {
+    PyObject *enum_base = PyObject_GetAttrString(enum_module, "Enum");
+    Py_DECREF(enum_module);
+    if (enum_base == NULL) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_ENTITY",
-                MD_TEXT_ENTITY) < 0) {
-        return -1;
+
+    int result = -1;
+    if (add_enum(m, enum_base, "BlockType", blocktype_doc,
+                blocktype_members, &BlockTypeEnum, &BlockTypeMembers) < 0) {
+        goto cleanup;
     }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_CODE",
-                MD_TEXT_CODE) < 0) {
-        return -1;
+    if (add_enum(m, enum_base, "SpanType", spantype_doc,
+                spantype_members, &SpanTypeEnum, &SpanTypeMembers) < 0) {
+        goto cleanup;
     }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_HTML",
-                MD_TEXT_HTML) < 0) {
-        return -1;
+    if (add_enum(m, enum_base, "TextType", texttype_doc,
+                texttype_members, &TextTypeEnum, &TextTypeMembers) < 0) {
+        goto cleanup;
     }
-    if (PyModule_AddIntConstant(m, "MD_TEXT_LATEXMATH",
-                MD_TEXT_LATEXMATH) < 0) {
-        return -1;
+    if (add_enum(m, enum_base, "Align", align_doc, align_members,
+                &AlignEnum, &AlignMembers) < 0) {
+        goto cleanup;
     }
-    return 0;
+    result = 0;
+
+cleanup:
+    Py_DECREF(enum_base);
+    return result;
 }
 
+/******************************************************************************
+ * Module-wide initialization related to enums                                *
+ ******************************************************************************/
+
 /*
- * Add MD_ALIGN enum constants
+ * Helper to add the enum constants and enum types to the _md4c module. Return
+ * 0 on success, -1 on error.
  */
-int add_align_consts(PyObject *m) {
-    if (PyModule_AddIntConstant(m, "MD_ALIGN_DEFAULT",
-                MD_ALIGN_DEFAULT) < 0) {
+int md4c_add_enums(PyObject *m) {
+    // Add all the enum constants to the module
+    if (add_consts(m, "MD_BLOCK_", blocktype_members) < 0) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_ALIGN_LEFT",
-                MD_ALIGN_LEFT) < 0) {
+    if (add_consts(m, "MD_SPAN_", spantype_members) < 0) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_ALIGN_CENTER",
-                MD_ALIGN_CENTER) < 0) {
+    if (add_consts(m, "MD_TEXT_", texttype_members) < 0) {
         return -1;
     }
-    if (PyModule_AddIntConstant(m, "MD_ALIGN_RIGHT",
-                MD_ALIGN_RIGHT) < 0) {
+    if (add_consts(m, "MD_ALIGN_", align_members) < 0) {
         return -1;
     }
-    return 0;
-}
-
-/******************************************************************************
- * Module-wide code                                                           *
- ******************************************************************************/
 
-/*
- * Module Definition
- */
-static PyModuleDef enum_consts_module = {
-    PyModuleDef_HEAD_INIT,
-    .m_name = "_enum_consts",
-    .m_doc = "Python bindings for MD4C enum constants",
-    .m_size = -1,
-};
-
-/*
- * Module initialization function
- */
-PyMODINIT_FUNC PyInit__enum_consts(void)
-{
-    // Create the module object
-    PyObject *m;
-    m = PyModule_Create(&enum_consts_module);
-    if (m == NULL) {
-        return NULL;
-    }
-
-    // Add all the enum constants to the module
-    if (add_blocktype_consts(m) < 0) {
-        Py_DECREF(m);
-        return NULL;
-    }
-    if (add_spantype_consts(m) < 0) {
-        Py_DECREF(m);
-        return NULL;
-    }
-    if (add_texttype_consts(m) < 0) {
-        Py_DECREF(m);
-        return NULL;
-    }
-    if (add_align_consts(m) < 0) {
-        Py_DECREF(m);
-        return NULL;
+    // Build the Python enum types from the same constants
+    if (add_enums(m) < 0) {
+        return -1;
     }
 
-    return m;
+    return 0;
 }
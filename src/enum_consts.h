@@ -0,0 +1,63 @@
+/*
+ * PyMD4C
+ * Python bindings for MD4C
+ *
+ * enum_consts.h - Enum constants and types for the md4c._md4c module
+ * Python bindings for the various enum constants for MD4C, along with the
+ * Python enum types built from them
+ *
+ * Copyright (c) 2020-2021 Dominick C. Pastore
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a
+ * copy of this software and associated documentation files (the "Software"),
+ * to deal in the Software without restriction, including without limitation
+ * the rights to use, copy, modify, merge, publish, distribute, sublicense,
+ * and/or sell copies of the Software, and to permit persons to whom the
+ * Software is furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in
+ * all copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+ * OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ * FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ * IN THE SOFTWARE.
+ */
+
+#ifndef ENUM_CONSTS_H
+#define ENUM_CONSTS_H
+
+#ifndef PY_SSIZE_T_CLEAN
+#define PY_SSIZE_T_CLEAN
+#endif
+#include <Python.h>
+
+/*
+ * The Python enum types (md4c.BlockType, etc.). These are set by
+ * md4c_add_enums() and never released.
+ */
+extern PyObject *BlockTypeEnum;
+extern PyObject *SpanTypeEnum;
+extern PyObject *TextTypeEnum;
+extern PyObject *AlignEnum;
+
+/*
+ * Tuples mapping each enum value to the corresponding member of the Python
+ * enum type, or None if no member has that value. Also set by
+ * md4c_add_enums() and never released.
+ */
+extern PyObject *BlockTypeMembers;
+extern PyObject *SpanTypeMembers;
+extern PyObject *TextTypeMembers;
+extern PyObject *AlignMembers;
+
+/*
+ * Helper to add the enum constants and enum types to the _md4c module. Return
+ * 0 on success, -1 on error.
+ */
+int md4c_add_enums(PyObject *m);
+
+#endif
@@ -36,6 +36,7 @@
 #include "entity.h"
 
 #include "pymd4c.h"
+#include "enum_consts.h"
 #include "generic_parser.h"
 
 /*
@@ -44,10 +45,11 @@
 typedef struct {
     PyObject_HEAD
     unsigned int parser_flags;
+    bool fast_enums;
 } GenericParserObject;
 
 /*
- * GenericParser.__init__(parser_flags: int)
+ * GenericParser.__init__(parser_flags: int, *, fast_enums: bool)
  */
 static int GenericParser_init(GenericParserObject *self, PyObject *args,
         PyObject *kwds) {
@@ -69,6 +71,7 @@ static int GenericParser_init(GenericParserObject *self, PyObject *args,
     unsigned int permissive_autolinks = 0;
     unsigned int no_html = 0;
     unsigned int dialect_github = 0;
+    int fast_enums = 0;
 
     static char *kwlist[] = {
         "parser_flags",
@@ -89,9 +92,10 @@ static int GenericParser_init(GenericParserObject *self, PyObject *args,
         "permissive_autolinks",
         "no_html",
         "dialect_github",
+        "fast_enums",
         NULL
     };
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|I$ppppppppppppppppp",
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|I$pppppppppppppppppp",
                                      kwlist, &parser_flags,
                                      &collapse_whitespace,
                                      &permissive_atx_headers,
@@ -102,7 +106,7 @@ static int GenericParser_init(GenericParserObject *self, PyObject *args,
                                      &permissive_www_autolinks, &tasklists,
                                      &latex_math_spans, &wikilinks, &underline,
                                      &permissive_autolinks, &no_html,
-                                     &dialect_github)) {
+                                     &dialect_github, &fast_enums)) {
         return -1;
     }
 
@@ -175,6 +179,7 @@ static int GenericParser_init(GenericParserObject *self, PyObject *args,
     }
 
     self->parser_flags = parser_flags;
+    self->fast_enums = fast_enums;
     return 0;
 }
 
@@ -190,94 +195,56 @@ typedef struct {
     PyObject *leave_span_callback;
     PyObject *text_callback;
     bool is_bytes;
+    bool fast_enums;
 } GenericParserCallbackData;
 
 /*
- * Helpers to get instances of the various enums
+ * Get the member of enum_type with the given value, using the value -> member
+ * lookup tuple where possible. Return a new reference, or NULL on failure.
  */
-static PyObject * get_enum_blocktype(int type) {
-    // Get the module
-    PyObject *enums = PyImport_AddModule(enums_module);
-    if (enums == NULL) {
-        return NULL;
-    }
-    // Get the enum class
-    PyObject *type_enum = PyObject_GetAttrString(enums, "BlockType");
-    if (type_enum == NULL) {
-        return NULL;
-    }
-    // Instantiate the enum
-    PyObject *instance = PyObject_CallFunction(type_enum, "(i)", type);
-    if (instance == NULL) {
-        Py_DECREF(type_enum);
-        return NULL;
+static PyObject * get_enum_member(PyObject *enum_type, PyObject *members,
+        int value) {
+    if (value >= 0 && value < PyTuple_GET_SIZE(members)) {
+        PyObject *member = PyTuple_GET_ITEM(members, value);
+        if (member != Py_None) {
+            Py_INCREF(member);
+            return member;
+        }
     }
-    // Clean up and return
-    Py_DECREF(type_enum);
-    return instance;
+
+    // Not in the lookup tuple. Let the enum type handle it (which will most
+    // likely raise ValueError).
+    return PyObject_CallFunction(enum_type, "(i)", value);
 }
-static PyObject * get_enum_spantype(int type) {
-    // Get the module
-    PyObject *enums = PyImport_AddModule(enums_module);
-    if (enums == NULL) {
-        return NULL;
-    }
-    // Get the enum class
-    PyObject *type_enum = PyObject_GetAttrString(enums, "SpanType");
-    if (type_enum == NULL) {
-        return NULL;
-    }
-    // Instantiate the enum
-    PyObject *instance = PyObject_CallFunction(type_enum, "(i)", type);
-    if (instance == NULL) {
-        Py_DECREF(type_enum);
-        return NULL;
+
+/*
+ * Helpers to get instances of the various enums. If fast_enums is true, the
+ * raw integer value is returned instead. Return a new reference, or NULL on
+ * failure.
+ */
+static PyObject * get_enum_blocktype(int type, bool fast_enums) {
+    if (fast_enums) {
+        return PyLong_FromLong(type);
     }
-    // Clean up and return
-    Py_DECREF(type_enum);
-    return instance;
+    return get_enum_member(BlockTypeEnum, BlockTypeMembers, type);
 }
-static PyObject * get_enum_texttype(int type) {
-    // Get the module
-    PyObject *enums = PyImport_AddModule(enums_module);
-    if (enums == NULL) {
-        return NULL;
-    }
-    // Get the enum class
-    PyObject *type_enum = PyObject_GetAttrString(enums, "TextType");
-    if (type_enum == NULL) {
-        return NULL;
-    }
-    // Instantiate the enum
-    PyObject *instance = PyObject_CallFunction(type_enum, "(i)", type);
-    if (instance == NULL) {
-        Py_DECREF(type_enum);
-        return NULL;
+static PyObject * get_enum_spantype(int type, bool fast_enums) {
+    if (fast_enums) {
+        return PyLong_FromLong(type);
     }
-    // Clean up and return
-    Py_DECREF(type_enum);
-    return instance;
+    return get_enum_member(SpanTypeEnum, SpanTypeMembers, type);
 }
-static PyObject * get_enum_align(int align) {
-    // Get the module
-    PyObject *enums = PyImport_AddModule(enums_module);
-    if (enums == NULL) {
-        return NULL;
-    }
-    // Get the enum class
-    PyObject *align_enum = PyObject_GetAttrString(enums, "Align");
-    if (align_enum == NULL) {
-        return NULL;
+static PyObject * get_enum_texttype(int type, bool fast_enums) {
+    if (fast_enums) {
+        return PyLong_FromLong(type);
     }
-    // Instantiate the enum
-    PyObject *instance = PyObject_CallFunction(align_enum, "(i)", align);
-    if (instance == NULL) {
-        Py_DECREF(align_enum);
-        return NULL;
+    return get_enum_member(TextTypeEnum, TextTypeMembers, type);
+}
+static PyObject * get_enum_align(int align, bool fast_enums) {
+    if (fast_enums) {
+        return PyLong_FromLong(align);
     }
-    // Clean up and return
-    Py_DECREF(align_enum);
-    return instance;
+    return get_enum_member(AlignEnum, AlignMembers, align);
 }
 
 /*
@@ -294,7 +261,7 @@ static PyObject * get_enum_align(int align) {
  * Return the list or None on success, NULL on failure
  */
 static PyObject * GenericParser_md_attribute(MD_ATTRIBUTE *attr,
-        bool is_bytes) {
+        bool is_bytes, bool fast_enums) {
     // If no MD_ATTRIBUTE, return None
     if (attr->text == NULL) {
         Py_RETURN_NONE;
@@ -309,8 +276,8 @@ static PyObject * GenericParser_md_attribute(MD_ATTRIBUTE *attr,
     // Add items
     for (int i = 0; attr->substr_offsets[i] != attr->size; i++) {
         // Init item
-        PyObject *item = Py_BuildValue(is_bytes ? "(Oy#)" : "(Os#)",
-                get_enum_texttype(attr->substr_types[i]),
+        PyObject *item = Py_BuildValue(is_bytes ? "(Ny#)" : "(Ns#)",
+                get_enum_texttype(attr->substr_types[i], fast_enums),
                 attr->text + attr->substr_offsets[i],
                 attr->substr_offsets[i + 1] - attr->substr_offsets[i]);
         if (item == NULL) {
@@ -324,6 +291,7 @@ static PyObject * GenericParser_md_attribute(MD_ATTRIBUTE *attr,
             Py_DECREF(list);
             return NULL;
         }
+        Py_DECREF(item);
     }
 
     return list;
@@ -333,19 +301,20 @@ static PyObject * GenericParser_md_attribute(MD_ATTRIBUTE *attr,
  * GenericParser C callbacks
  */
 static int GenericParser_block(MD_BLOCKTYPE type, void *detail,
-        PyObject *python_callback, bool is_bytes) {
+        PyObject *python_callback, bool is_bytes, bool fast_enums) {
     // Construct arguments
     PyObject *arglist;
     switch(type) {
         case MD_BLOCK_UL:
-            arglist = Py_BuildValue("(O{s:N,s:C})", get_enum_blocktype(type),
+            arglist = Py_BuildValue("(N{s:N,s:C})",
+                    get_enum_blocktype(type, fast_enums),
                     "is_tight",
                     PyBool_FromLong(((MD_BLOCK_UL_DETAIL *) detail)->is_tight),
                     "mark", ((MD_BLOCK_UL_DETAIL *) detail)->mark);
             break;
         case MD_BLOCK_OL:
-            arglist = Py_BuildValue("(O{s:I,s:N,s:C})",
-                    get_enum_blocktype(type),
+            arglist = Py_BuildValue("(N{s:I,s:N,s:C})",
+                    get_enum_blocktype(type, fast_enums),
                     "start", ((MD_BLOCK_OL_DETAIL *) detail)->start,
                     "is_tight",
                     PyBool_FromLong(((MD_BLOCK_OL_DETAIL *) detail)->is_tight),
@@ -354,42 +323,45 @@ static int GenericParser_block(MD_BLOCKTYPE type, void *detail,
             break;
         case MD_BLOCK_LI:
             if (((MD_BLOCK_LI_DETAIL *) detail)->is_task) {
-                arglist = Py_BuildValue("(O{s:O,s:C,s:I})",
-                        get_enum_blocktype(type), "is_task", Py_True,
+                arglist = Py_BuildValue("(N{s:O,s:C,s:I})",
+                        get_enum_blocktype(type, fast_enums),
+                        "is_task", Py_True,
                         "task_mark",
                         ((MD_BLOCK_LI_DETAIL *) detail)->task_mark,
                         "task_mark_offset", ((MD_BLOCK_LI_DETAIL *) detail)->
                             task_mark_offset);
             } else {
-                arglist = Py_BuildValue("(O{s:O})", get_enum_blocktype(type),
+                arglist = Py_BuildValue("(N{s:O})",
+                        get_enum_blocktype(type, fast_enums),
                         "is_task", Py_False);
             }
             break;
         case MD_BLOCK_H:
-            arglist = Py_BuildValue("(O{s:I})", get_enum_blocktype(type),
+            arglist = Py_BuildValue("(N{s:I})",
+                    get_enum_blocktype(type, fast_enums),
                     "level", ((MD_BLOCK_H_DETAIL *) detail)->level);
             break;
         case MD_BLOCK_CODE:
             if (((MD_BLOCK_CODE_DETAIL *) detail)->fence_char == '\0') {
-                Py_INCREF(Py_None);
-                arglist = Py_BuildValue("(O{s:O})", get_enum_blocktype(type),
+                arglist = Py_BuildValue("(N{s:O})",
+                        get_enum_blocktype(type, fast_enums),
                         "fence_char", Py_None);
             } else {
-                arglist = Py_BuildValue("(O{s:O,s:O,s:C})",
-                        get_enum_blocktype(type),
+                arglist = Py_BuildValue("(N{s:N,s:N,s:C})",
+                        get_enum_blocktype(type, fast_enums),
                         "info", GenericParser_md_attribute(
                             &((MD_BLOCK_CODE_DETAIL *) detail)->info,
-                            is_bytes),
+                            is_bytes, fast_enums),
                         "lang", GenericParser_md_attribute(
                             &((MD_BLOCK_CODE_DETAIL *) detail)->lang,
-                            is_bytes),
+                            is_bytes, fast_enums),
                         "fence_char", ((MD_BLOCK_CODE_DETAIL *) detail)->
                             fence_char);
             }
             break;
         case MD_BLOCK_TABLE:
-            arglist = Py_BuildValue("(O{s:I,s:I,s:I})",
-                    get_enum_blocktype(type),
+            arglist = Py_BuildValue("(N{s:I,s:I,s:I})",
+                    get_enum_blocktype(type, fast_enums),
                     "col_count", ((MD_BLOCK_TABLE_DETAIL *) detail)->col_count,
                     "head_row_count", ((MD_BLOCK_TABLE_DETAIL *) detail)->
                         head_row_count,
@@ -398,12 +370,14 @@ static int GenericParser_block(MD_BLOCKTYPE type, void *detail,
             break;
         case MD_BLOCK_TH:
         case MD_BLOCK_TD:
-            arglist = Py_BuildValue("(O{s:O})", get_enum_blocktype(type),
+            arglist = Py_BuildValue("(N{s:N})",
+                    get_enum_blocktype(type, fast_enums),
                     "align", get_enum_align(
-                        ((MD_BLOCK_TD_DETAIL *) detail)->align));
+                        ((MD_BLOCK_TD_DETAIL *) detail)->align, fast_enums));
             break;
         default:
-            arglist = Py_BuildValue("(O{})", get_enum_blocktype(type));
+            arglist = Py_BuildValue("(N{})",
+                    get_enum_blocktype(type, fast_enums));
     }
     if (arglist == NULL) {
         return -1;
@@ -426,41 +400,51 @@ static int GenericParser_enter_block(MD_BLOCKTYPE type, void *detail,
         void *cb_data) {
     return GenericParser_block(type, detail,
             ((GenericParserCallbackData *) cb_data)->enter_block_callback,
-            ((GenericParserCallbackData *) cb_data)->is_bytes);
+            ((GenericParserCallbackData *) cb_data)->is_bytes,
+            ((GenericParserCallbackData *) cb_data)->fast_enums);
 }
 static int GenericParser_leave_block(MD_BLOCKTYPE type, void *detail,
         void *cb_data) {
     return GenericParser_block(type, detail,
             ((GenericParserCallbackData *) cb_data)->leave_block_callback,
-            ((GenericParserCallbackData *) cb_data)->is_bytes);
+            ((GenericParserCallbackData *) cb_data)->is_bytes,
+            ((GenericParserCallbackData *) cb_data)->fast_enums);
 }
 static int GenericParser_span(MD_SPANTYPE type, void *detail,
-        PyObject *python_callback, bool is_bytes) {
+        PyObject *python_callback, bool is_bytes, bool fast_enums) {
     // Construct arguments
     PyObject *arglist;
     switch(type) {
         case MD_SPAN_A:
-            arglist = Py_BuildValue("(O{s:O,s:O})", get_enum_spantype(type),
+            arglist = Py_BuildValue("(N{s:N,s:N})",
+                    get_enum_spantype(type, fast_enums),
                     "href", GenericParser_md_attribute(
-                        &((MD_SPAN_A_DETAIL *) detail)->href, is_bytes),
+                        &((MD_SPAN_A_DETAIL *) detail)->href,
+                        is_bytes, fast_enums),
                     "title", GenericParser_md_attribute(
-                        &((MD_SPAN_A_DETAIL *) detail)->title, is_bytes));
+                        &((MD_SPAN_A_DETAIL *) detail)->title,
+                        is_bytes, fast_enums));
             break;
         case MD_SPAN_IMG:
-            arglist = Py_BuildValue("(O{s:O,s:O})", get_enum_spantype(type),
+            arglist = Py_BuildValue("(N{s:N,s:N})",
+                    get_enum_spantype(type, fast_enums),
                     "src", GenericParser_md_attribute(
-                        &((MD_SPAN_IMG_DETAIL *) detail)->src, is_bytes),
+                        &((MD_SPAN_IMG_DETAIL *) detail)->src,
+                        is_bytes, fast_enums),
                     "title", GenericParser_md_attribute(
-                        &((MD_SPAN_IMG_DETAIL *) detail)->title, is_bytes));
+                        &((MD_SPAN_IMG_DETAIL *) detail)->title,
+                        is_bytes, fast_enums));
             break;
         case MD_SPAN_WIKILINK:
-            arglist = Py_BuildValue("(O{s:O})", get_enum_spantype(type),
+            arglist = Py_BuildValue("(N{s:N})",
+                    get_enum_spantype(type, fast_enums),
                     "target", GenericParser_md_attribute(
                         &((MD_SPAN_WIKILINK_DETAIL *) detail)->target,
-                        is_bytes));
+                        is_bytes, fast_enums));
             break;
         default:
-            arglist = Py_BuildValue("(O{})", get_enum_spantype(type));
+            arglist = Py_BuildValue("(N{})",
+                    get_enum_spantype(type, fast_enums));
     }
     if (arglist == NULL) {
         return -1;
@@ -483,22 +467,27 @@ static int GenericParser_enter_span(MD_SPANTYPE type, void *detail,
         void *cb_data) {
     return GenericParser_span(type, detail,
             ((GenericParserCallbackData *) cb_data)->enter_span_callback,
-            ((GenericParserCallbackData *) cb_data)->is_bytes);
+            ((GenericParserCallbackData *) cb_data)->is_bytes,
+            ((GenericParserCallbackData *) cb_data)->fast_enums);
 }
 static int GenericParser_leave_span(MD_SPANTYPE type, void *detail,
         void *cb_data) {
     return GenericParser_span(type, detail,
             ((GenericParserCallbackData *) cb_data)->leave_span_callback,
-            ((GenericParserCallbackData *) cb_data)->is_bytes);
+            ((GenericParserCallbackData *) cb_data)->is_bytes,
+            ((GenericParserCallbackData *) cb_data)->fast_enums);
 }
 static int GenericParser_text(MD_TEXTTYPE type, const char *text, MD_SIZE size,
         void *cb_data) {
     // Construct arguments
     PyObject *arglist;
+    bool fast_enums = ((GenericParserCallbackData *) cb_data)->fast_enums;
     if (((GenericParserCallbackData *) cb_data)->is_bytes) {
-        arglist = Py_BuildValue("(Oy#)", get_enum_texttype(type), text, size);
+        arglist = Py_BuildValue("(Ny#)", get_enum_texttype(type, fast_enums),
+                text, size);
     } else {
-        arglist = Py_BuildValue("(Os#)", get_enum_texttype(type), text, size);
+        arglist = Py_BuildValue("(Ns#)", get_enum_texttype(type, fast_enums),
+                text, size);
     }
     if (arglist == NULL) {
         return -1;
@@ -567,6 +556,7 @@ static PyObject * GenericParser_parse(GenericParserObject *self,
         // bytes
         cb_data.is_bytes = true;
     }
+    cb_data.fast_enums = self->fast_enums;
 
     // Check that callbacks are all valid
     if (!PyCallable_Check(cb_data.enter_block_callback)) {
@@ -723,7 +713,14 @@ PyTypeObject GenericParserType = {
         ":type parser_flags: int, optional\n"
         "\n"
         "Option flags may also be specified in keyword-argument form for more "
-        "readability. See :ref:`options`.\n",
+        "readability. See :ref:`options`.\n"
+        "\n"
+        ":param fast_enums: Keyword-only. If true, callbacks receive plain "
+        ":class:`int` values instead of :class:`BlockType`, "
+        ":class:`SpanType`, :class:`TextType`, and :class:`Align` instances, "
+        "which avoids creating an enum instance for every callback. Compare "
+        "them against the constants in :mod:`md4c.fast_consts`.\n"
+        ":type fast_enums: bool, optional\n",
     .tp_basicsize = sizeof(GenericParserObject),
     .tp_itemsize = 0,
     .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC,
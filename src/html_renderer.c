@@ -54,15 +54,20 @@ typedef struct {
 } DynamicBuffer;
 
 /*
- * Initialize a DynamicBuffer. Return 0 on success, -1 on failure.
+ * Initialize a DynamicBuffer with room for at least size_hint bytes. Return 0
+ * on success, -1 on failure.
  */
-static int buffer_init(DynamicBuffer *buf) {
-    buf->data = malloc(DYNAMICBUFFER_INITSIZE);
+static int buffer_init(DynamicBuffer *buf, size_t size_hint) {
+    size_t len = DYNAMICBUFFER_INITSIZE;
+    if (size_hint > len) {
+        len = size_hint;
+    }
+    buf->data = malloc(len);
     if (buf->data == NULL) {
         return -1;
     }
     buf->pos = 0;
-    buf->len = DYNAMICBUFFER_INITSIZE;
+    buf->len = len;
     return 0;
 }
 
@@ -288,21 +293,15 @@ static void HTMLRenderer_parse_callback(const char *output,
 }
 
 /*
- * HTMLRenderer.parse(input: str) -> str
- * Parse a Markdown document and return the rendered HTML
+ * Render a Markdown document (str or bytes) to HTML with the given flags.
+ * Return the HTML as the same type as the input, or NULL on failure.
  */
-static PyObject * HTMLRenderer_parse(HTMLRendererObject *self,
-        PyObject *args) {
+static PyObject * render_html(PyObject *input_obj, unsigned int parser_flags,
+        unsigned int renderer_flags) {
     PyThreadState *_save;
-
-    // Parse arguments
-    PyObject *input_obj;
     const char *input;
     Py_ssize_t in_size;
     bool is_bytes;
-    if (!PyArg_ParseTuple(args, "O", &input_obj)) {
-        return NULL;
-    }
 
     // Extract contents of str or bytes
     if (PyBytes_AsStringAndSize(input_obj, (char **) &input, &in_size) < 0) {
@@ -319,32 +318,46 @@ static PyObject * HTMLRenderer_parse(HTMLRendererObject *self,
     }
     Py_INCREF(input_obj);
 
-    // Do the parse
+    // Do the parse. The output is usually a bit larger than the input, so
+    // start the buffer there to avoid most of the regrowing.
     Py_UNBLOCK_THREADS
     DynamicBuffer buf;
-    if (buffer_init(&buf) < 0) {
+    if (buffer_init(&buf, in_size + in_size / 4) < 0) {
         Py_BLOCK_THREADS
         Py_DECREF(input_obj);
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
     }
     int sts = md_html(input, in_size, HTMLRenderer_parse_callback,
-            &buf, self->parser_flags, self->renderer_flags);
+            &buf, parser_flags, renderer_flags);
     Py_BLOCK_THREADS
 
     // Return
     Py_DECREF(input_obj);
     if (sts < 0) {
+        buffer_free(&buf);
         PyErr_SetString(ParseError, "Could not parse markdown");
         return NULL;
     }
     PyObject *result = Py_BuildValue(is_bytes ? "y#" : "s#",
             buf.data, buf.pos);
     buffer_free(&buf);
-    if (result == NULL) {
+    return result;
+}
+
+/*
+ * HTMLRenderer.parse(input: str) -> str
+ * Parse a Markdown document and return the rendered HTML
+ */
+static PyObject * HTMLRenderer_parse(HTMLRendererObject *self,
+        PyObject *args) {
+    // Parse arguments
+    PyObject *input_obj;
+    if (!PyArg_ParseTuple(args, "O", &input_obj)) {
         return NULL;
     }
-    return result;
+
+    return render_html(input_obj, self->parser_flags, self->renderer_flags);
 }
 
 /*
@@ -415,6 +428,33 @@ PyTypeObject HTMLRendererType = {
     .tp_methods = HTMLRenderer_methods,
 };
 
+/******************************************************************************
+ * markdown_to_html() function                                                *
+ ******************************************************************************/
+
+/*
+ * markdown_to_html(input: str, parser_flags: int, renderer_flags: int) -> str
+ * Parse a Markdown document and return the rendered HTML, without creating an
+ * HTMLRenderer
+ */
+PyObject * markdown_to_html(PyObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *input_obj;
+    unsigned int parser_flags = 0;
+    unsigned int renderer_flags = 0;
+    static char *kwlist[] = {
+        "markdown",
+        "parser_flags",
+        "renderer_flags",
+        NULL,
+    };
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|II:markdown_to_html",
+                kwlist, &input_obj, &parser_flags, &renderer_flags)) {
+        return NULL;
+    }
+
+    return render_html(input_obj, parser_flags, renderer_flags);
+}
+
 /******************************************************************************
  * Module-wide initialization related to HTMLRenderer                         *
  ******************************************************************************/
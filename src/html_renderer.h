@@ -39,6 +39,30 @@
  */
 extern PyTypeObject HTMLRendererType;
 
+/*
+ * markdown_to_html() function
+ */
+PyObject * markdown_to_html(PyObject *self, PyObject *args, PyObject *kwds);
+#define MARKDOWN_TO_HTML_DOC "markdown_to_html(markdown, parser_flags=0, " \
+    "renderer_flags=0)\n" \
+    "\n" \
+    "Parse a Markdown document and return the rendered HTML. This is " \
+    "equivalent to ``HTMLRenderer(parser_flags, renderer_flags)" \
+    ".parse(markdown)``, but does not create an :class:`HTMLRenderer`.\n" \
+    "\n" \
+    ":param markdown: The Markdown text to parse. If provided as a " \
+    ":class:`bytes`, it must be UTF-8 encoded.\n" \
+    ":type markdown: str or bytes\n" \
+    ":param parser_flags: Zero or more parser option flags OR'd together. " \
+    "See :ref:`options`.\n" \
+    ":type parser_flags: int, optional\n" \
+    ":param renderer_flags: Zero or more HTML renderer option flags OR'd " \
+    "together. See :ref:`options`.\n" \
+    ":type renderer_flags: int, optional\n" \
+    ":return: The generated HTML\n" \
+    ":rtype: str or bytes\n" \
+    ":raises ParseError: if there is a runtime error while parsing\n"
+
 /*
  * Helper to add HTML renderer flags to the _md4c module. Return 0 on success,
  * -1 on error.
@@ -37,11 +37,7 @@
 #include "pymd4c.h"
 #include "generic_parser.h"
 #include "html_renderer.h"
-
-/*
- * Name of enums module to import
- */
-const char *enums_module = "md4c.enums";
+#include "enum_consts.h"
 
 /*
  * Exception objects
@@ -140,6 +136,8 @@ static int md4c_add_flags(PyObject *m) {
  */
 static PyMethodDef md4c_methods[] = {
     {"lookup_entity", lookup_entity, METH_VARARGS, LOOKUP_ENTITY_DOC},
+    {"markdown_to_html", (PyCFunction) markdown_to_html,
+        METH_VARARGS | METH_KEYWORDS, MARKDOWN_TO_HTML_DOC},
     {NULL, NULL, 0, NULL}
 };
 
@@ -180,6 +178,12 @@ PyMODINIT_FUNC PyInit__md4c(void)
         return NULL;
     }
 
+    // Add the enum constants and enum types to the module
+    if (md4c_add_enums(m) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+
     // Add the types to the module
     Py_INCREF(&HTMLRendererType);
     if (PyModule_AddObject(m, "HTMLRenderer", (PyObject *) &HTMLRendererType)
@@ -222,13 +226,5 @@ PyMODINIT_FUNC PyInit__md4c(void)
         return NULL;
     }
 
-    // Import the md4c._enums module
-    PyObject *enums = PyImport_ImportModule(enums_module);
-    if (enums == NULL) {
-        Py_DECREF(m);
-        return NULL;
-    }
-    Py_DECREF(enums);
-
     return m;
 }
@@ -41,9 +41,4 @@
 extern PyObject *ParseError;
 extern PyObject *StopParsing;
 
-/*
- * Name of enums module to import
- */
-extern const char *enums_module;
-
 #endif
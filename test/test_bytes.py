@@ -116,6 +116,12 @@ def test_bytes_htmlrenderer(html_renderer, md, expected):
     actual = html_renderer.parse(md)
     assert actual == expected
 
+@pytest.mark.parametrize('md,expected', ((y, z) for _, y, z in scenarios),
+                         ids=(x for x, _, _ in scenarios))
+def test_bytes_markdown_to_html(md, expected):
+    actual = md4c.markdown_to_html(md)
+    assert actual == expected
+
 @pytest.mark.parametrize('md,expected', ((y, z) for _, y, z in scenarios),
                          ids=(x for x, _, _ in scenarios))
 def test_bytes_domparser(dom_parser, md, expected):
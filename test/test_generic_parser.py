@@ -0,0 +1,121 @@
+#
+# PyMD4C
+# Python bindings for MD4C
+#
+# Tests for GenericParser and ParserObject
+#
+# Copyright (c) 2021 Dominick C. Pastore
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+
+import md4c
+import md4c.domparser
+import md4c.fast_consts
+import pytest
+
+
+class EventRecorder(md4c.ParserObject):
+    """ParserObject that records every callback it receives"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.events = []
+
+    def enter_block(self, block_type, details):
+        self.events.append(('enter_block', block_type, details))
+
+    def leave_block(self, block_type, details):
+        self.events.append(('leave_block', block_type, details))
+
+    def enter_span(self, span_type, details):
+        self.events.append(('enter_span', span_type, details))
+
+    def leave_span(self, span_type, details):
+        self.events.append(('leave_span', span_type, details))
+
+    def text(self, text_type, text):
+        self.events.append(('text', text_type, text))
+
+
+FAST_MD = """\
+# Heading
+
+Some *text* with [a link](/url "title") and `code`.
+
+| a | b |
+|:--|--:|
+| c | d |
+"""
+
+
+def _as_ints(value):
+    """Convert enum instances (including those nested in details) to ints"""
+    if isinstance(value, (md4c.BlockType, md4c.SpanType, md4c.TextType,
+                          md4c.Align)):
+        return value.value
+    if isinstance(value, dict):
+        return {k: _as_ints(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_as_ints(v) for v in value)
+    return value
+
+
+def test_fast_enums():
+    """With fast_enums, callbacks get the same values as plain ints"""
+    slow = EventRecorder(md4c.MD_FLAG_TABLES)
+    slow.parse(FAST_MD)
+    fast = EventRecorder(md4c.MD_FLAG_TABLES, fast_enums=True)
+    fast.parse(FAST_MD)
+    assert fast.events == _as_ints(slow.events)
+    assert all(type(event[1]) is int for event in fast.events)
+    assert ('enter_block', md4c.fast_consts.BLOCK_TD,
+            {'align': md4c.fast_consts.ALIGN_RIGHT}) in fast.events
+
+
+@pytest.mark.parametrize('enum', [md4c.BlockType, md4c.SpanType,
+                                  md4c.TextType, md4c.Align])
+def test_fast_consts(enum):
+    """Every enum member has a matching constant in md4c.fast_consts"""
+    prefix = {
+        md4c.BlockType: 'BLOCK_',
+        md4c.SpanType: 'SPAN_',
+        md4c.TextType: 'TEXT_',
+        md4c.Align: 'ALIGN_',
+    }[enum]
+    for member in enum:
+        assert getattr(md4c.fast_consts, prefix + member.name) == member.value
+
+
+def test_domparser_no_fast_enums():
+    with pytest.raises(ValueError):
+        md4c.domparser.DOMParser(fast_enums=True)
+
+
+def test_enum_members():
+    """Callbacks receive the enum members themselves, which keep Enum
+    semantics"""
+    parser = EventRecorder(md4c.MD_FLAG_TABLES)
+    parser.parse(FAST_MD)
+    for event in parser.events:
+        enum_type = type(event[1])
+        assert event[1] is enum_type(event[1].value)
+    assert md4c.BlockType.P != md4c.SpanType.U
+    assert md4c.BlockType.P != md4c.BlockType.P.value
+    assert {md4c.BlockType.P: 1}[md4c.BlockType(md4c.BlockType.P.value)] == 1
@@ -5,6 +5,7 @@
 
 import sys
 import os
+import io
 import os.path
 import re
 import md4c
@@ -160,6 +161,821 @@ def test_domparser_html(test_case, md4c_version):
     assert html_output == dom_output
 
 
+@pytest.mark.parametrize(
+    'test_case', collect_all_tests(),
+     ids=lambda x: f'{x["file"]}:{x["start_line"]}-{x["section"]}')
+def test_markdown_to_html(test_case, md4c_version):
+    """Test that the output for markdown_to_html() matches HTMLRenderer char
+    for char"""
+    skip_if_older_version(md4c_version, test_case['md4c_version'])
+
+    parser_flags = 0
+    for extension in test_case['extensions']:
+        parser_flags |= extension_flags[extension]
+
+    html_renderer = md4c.HTMLRenderer(parser_flags)
+    html_output = html_renderer.parse(test_case['markdown'])
+
+    assert md4c.markdown_to_html(test_case['markdown'],
+                                 parser_flags) == html_output
+
+
+def test_domparser_render_override():
+    """Test that a node class overriding only render() is still used when
+    it is rendered as part of a larger document"""
+    registry = md4c.domparser.NODE_FACTORY
+    original = registry[md4c.BlockType.HR]
+
+    class StarRule(md4c.domparser.HorizontalRule,
+                   element_type=md4c.BlockType.HR):
+        def render(self, **kwargs):
+            return '<p>***</p>\n'
+
+    try:
+        dom_parser = md4c.domparser.DOMParser()
+        output = dom_parser.parse('a\n\n---\n\nb\n').render()
+    finally:
+        registry[md4c.BlockType.HR] = original
+
+    assert output == '<p>a</p>\n<p>***</p>\n<p>b</p>\n'
+
+
+def test_domparser_close_tag_in_image():
+    """Test that link classes overriding only render_pre() do not leave their
+    closing tag in image alt text"""
+    registry = md4c.domparser.NODE_FACTORY
+    originals = {element_type: registry[element_type]
+                 for element_type in (md4c.SpanType.A,
+                                      md4c.SpanType.WIKILINK)}
+
+    class MyLink(md4c.domparser.Link, element_type=md4c.SpanType.A):
+        def render_pre(self, **kwargs):
+            return super().render_pre(**kwargs)
+
+    class MyWikiLink(md4c.domparser.WikiLink,
+                     element_type=md4c.SpanType.WIKILINK):
+        def render_pre(self, **kwargs):
+            return super().render_pre(**kwargs)
+
+    markdown = '![a [b](/u) [[c]] d](/img.png) [e](/u) [[f]]\n'
+    try:
+        dom_parser = md4c.domparser.DOMParser(md4c.MD_FLAG_WIKILINKS)
+        output = dom_parser.parse(markdown).render()
+        bytes_output = dom_parser.parse(markdown.encode()).render()
+    finally:
+        registry.update(originals)
+
+    expected = ('<p><img src="/img.png" alt="a b c d"> <a href="/u">e</a>'
+                ' <x-wikilink data-target="f">f</x-wikilink></p>\n')
+    assert output == expected
+    assert bytes_output == expected.encode()
+
+
+def test_domparser_escape_override():
+    """Test that text node classes overriding the escaping classmethods or
+    html_escape_table are used when rendering a whole document"""
+    registry = md4c.domparser.NODE_FACTORY
+    original = registry[md4c.TextType.NORMAL]
+    markdown = 'hello *"x"* banana\n'
+
+    class UpperText(md4c.domparser.NormalText,
+                    element_type=md4c.TextType.NORMAL):
+        @classmethod
+        def html_escape(cls, text):
+            return text.upper()
+
+        @classmethod
+        def url_escape(cls, text):
+            return 'URL(' + text + ')'
+
+    try:
+        output = md4c.domparser.DOMParser().parse(markdown).render()
+    finally:
+        registry[md4c.TextType.NORMAL] = original
+
+    assert output == '<p>HELLO <em>"X"</em> BANANA</p>\n'
+
+    class TableText(md4c.domparser.NormalText,
+                    element_type=md4c.TextType.NORMAL):
+        html_escape_table = {ord('b'): 'B'}
+
+    try:
+        output = md4c.domparser.DOMParser().parse(markdown).render()
+    finally:
+        registry[md4c.TextType.NORMAL] = original
+
+    assert output == '<p>hello <em>"x"</em> Banana</p>\n'
+
+
+def test_domparser_attr_escape_override():
+    """Test that link and image attributes use the escaping classmethods of
+    text and entity classes that override them"""
+    registry = md4c.domparser.NODE_FACTORY
+    normal = registry[md4c.TextType.NORMAL]
+    entity = registry[md4c.TextType.ENTITY]
+
+    class UpperText(md4c.domparser.NormalText,
+                    element_type=md4c.TextType.NORMAL):
+        @classmethod
+        def url_escape(cls, text):
+            return 'URL(' + text + ')'
+
+    class BracketEntity(md4c.domparser.HTMLEntity,
+                        element_type=md4c.TextType.ENTITY):
+        @classmethod
+        def html_escape(cls, text):
+            return '[' + text + ']'
+
+    try:
+        output = md4c.domparser.DOMParser().parse(
+            '[x](http://a.b/c) ![y](/i "a &amp; b")\n').render()
+    finally:
+        registry[md4c.TextType.NORMAL] = normal
+        registry[md4c.TextType.ENTITY] = entity
+
+    assert output == ('<p><a href="URL(http://a.b/c)">x</a> '
+                      '<img src="URL(/i)" alt="y" title="a [&] b"></p>\n')
+
+
+def test_domparser_node_factory():
+    """Test that every element type has a node class registered, and that
+    ASTNode() and the built-in classes construct that class"""
+    registry = md4c.domparser.NODE_FACTORY
+    for enum in (md4c.BlockType, md4c.SpanType, md4c.TextType):
+        for element_type in enum:
+            assert element_type in registry
+    node = md4c.domparser.ASTNode(md4c.TextType.NORMAL, text='a')
+    assert type(node) is registry[md4c.TextType.NORMAL]
+
+    original = registry[md4c.BlockType.P]
+
+    class MyParagraph(md4c.domparser.Paragraph,
+                      element_type=md4c.BlockType.P):
+        pass
+
+    try:
+        node = md4c.domparser.Paragraph(md4c.BlockType.P)
+    finally:
+        registry[md4c.BlockType.P] = original
+    assert type(node) is MyParagraph
+
+
+def test_domparser_static_tags():
+    """Test that the tags and text precomputed for classes with constant output
+    match what render_pre(), render_post(), and render() return"""
+    assert md4c.domparser.ListItem._static_close_tag
+    for element_type, cls in md4c.domparser.NODE_FACTORY.items():
+        if issubclass(cls, md4c.domparser.TextNode) and cls._static_text:
+            for text in ('', b''):
+                node = cls(element_type, text=text,
+                           use_bytes=isinstance(text, bytes))
+                rendered = (cls._static_text_bytes if node.bytes
+                            else cls._static_text_str)
+                assert rendered == (node.render(),
+                                    node.render(image_nesting_level=1))
+        if not issubclass(cls, md4c.domparser.ContainerNode):
+            continue
+        if cls._static_close_tag:
+            for use_bytes in (False, True):
+                node = object.__new__(cls)
+                node.bytes = use_bytes
+                tag = (cls._static_close_tag_bytes if use_bytes
+                       else cls._static_close_tag_str)
+                assert tag == node.render_post()
+        if not cls._static_tags:
+            continue
+        for use_bytes in (False, True):
+            # Some of these classes require attributes that do not affect
+            # their tags, so skip __init__()
+            node = object.__new__(cls)
+            node.bytes = use_bytes
+            tags = (cls._static_tags_bytes if use_bytes
+                    else cls._static_tags_str)
+            assert tags == (node.render_pre(), node.render_post())
+            if cls._transparent_in_image:
+                empty = b'' if use_bytes else ''
+                assert node.render_pre(image_nesting_level=1) == empty
+                assert node.render_post(image_nesting_level=1) == empty
+
+
+def test_domparser_interned_tags():
+    """Test that the str tags and text precomputed for node classes are
+    interned, so that every node rendering the same tag shares one object"""
+    for cls in md4c.domparser.NODE_FACTORY.values():
+        strings = []
+        if issubclass(cls, md4c.domparser.TextNode) and cls._static_text:
+            strings.extend(cls._static_text_str)
+        if issubclass(cls, md4c.domparser.ContainerNode):
+            if cls._static_tags:
+                strings.extend(cls._static_tags_str)
+            if cls._static_close_tag:
+                strings.append(cls._static_close_tag_str)
+        for string in strings:
+            assert string is sys.intern(string), (cls.__name__, string)
+    for tags in (md4c.domparser.Heading._open_tags,
+                 md4c.domparser.OrderedList._open_tags,
+                 md4c.domparser.TableCell._open_tags):
+        for tag in tags.values():
+            assert tag is sys.intern(tag)
+
+
+@pytest.mark.parametrize('text', ['&lt; a&b <"x"> \u00e9', b'&lt; a&b <"x">'])
+def test_html_escape(text):
+    """Test HTML escaping of short and long (uncached) text"""
+    expected = '&amp;lt; a&amp;b &lt;&quot;x&quot;&gt;'
+    if isinstance(text, bytes):
+        expected = expected.encode()
+    else:
+        expected += ' \u00e9'
+    escape = md4c.domparser.TextNode.html_escape
+    assert escape(text) == expected
+    assert escape(text * 1000) == expected * 1000
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('a b/c', 'a%20b/c'),
+    ('x?y=1&z=2#f', 'x?y=1&amp;z=2#f'),
+    ('\u00e9"<>[]', '%C3%A9%22%3C%3E%5B%5D'),
+    ('`{}|^_.-', '%60%7B%7D%7C%5E_.-'),
+])
+def test_url_escape(text, expected):
+    """Test URL escaping of str and bytes, short and long (uncached)"""
+    escape = md4c.domparser.TextNode.url_escape
+    assert escape(text) == expected
+    assert escape(text * 1000) == expected * 1000
+    assert escape(text.encode()) == expected.encode()
+
+
+def test_text_escape_override():
+    """Test that TextNode.render() uses overridden escaping classmethods and
+    html_escape_table"""
+    class UpperText(md4c.domparser.NormalText, element_type=None):
+        @classmethod
+        def html_escape(cls, text):
+            return text.upper()
+
+        @classmethod
+        def url_escape(cls, text):
+            return 'URL(' + text + ')'
+
+    class TableText(md4c.domparser.NormalText, element_type=None):
+        html_escape_table = {ord('b'): 'B'}
+
+    node = object.__new__(UpperText)
+    node.text = 'a<b'
+    assert node.render() == 'A<B'
+    assert node.render(url_escape=True) == 'URL(a<b)'
+    node = object.__new__(TableText)
+    node.text = 'banana'
+    assert node.render() == 'Banana'
+    assert TableText.html_escape(b'banana') == b'Banana'
+    assert md4c.domparser.NormalText.html_escape('banana<') == 'banana&lt;'
+
+
+def test_entity_escape_override():
+    """Test that HTMLEntity.render() uses overridden escaping classmethods"""
+    class BracketEntity(md4c.domparser.HTMLEntity, element_type=None):
+        @classmethod
+        def html_escape(cls, text):
+            return '[' + text + ']'
+
+    node = object.__new__(BracketEntity)
+    node.text = '&amp;'
+    assert node.render() == '[&]'
+    node.text = '&#0;'
+    assert node.render() == '[\ufffd]'
+    node.text = '&quot;'
+    assert node.render(url_escape=True) == '%22'
+
+
+def test_domparser_entity_escape_override():
+    """Test that entity classes overriding the escaping classmethods are used
+    when rendering a whole document"""
+    registry = md4c.domparser.NODE_FACTORY
+    original = registry[md4c.TextType.ENTITY]
+
+    class BracketEntity(md4c.domparser.HTMLEntity,
+                        element_type=md4c.TextType.ENTITY):
+        @classmethod
+        def html_escape(cls, text):
+            return '[' + text + ']'
+
+    try:
+        output = md4c.domparser.DOMParser().parse('a &amp; b\n').render()
+    finally:
+        registry[md4c.TextType.ENTITY] = original
+
+    assert output == '<p>a [&] b</p>\n'
+
+
+@pytest.mark.parametrize('url', [
+    'a b', '/\u00e9t\u00e9/?q=\u4e2d\u6587', 'x?a=1&b=2', '%20already',
+])
+def test_domparser_url_escape(url):
+    """Test that link and image URLs with spaces, non-ASCII text, and
+    characters MD4C leaves alone render the same as with the HTML renderer"""
+    markdown = f'[a](<{url}>) ![b](<{url}>)\n'
+    html_output = md4c.HTMLRenderer().parse(markdown)
+    assert md4c.domparser.DOMParser().parse(markdown).render() == html_output
+    assert (md4c.domparser.DOMParser().parse(markdown.encode()).render() ==
+            html_output.encode())
+
+
+def test_domparser_slots():
+    """Test that the built-in AST node classes do not give their instances a
+    __dict__"""
+    for cls in md4c.domparser.NODE_FACTORY.values():
+        assert cls.__dictoffset__ == 0, cls.__name__
+
+
+def test_domparser_attribute_change():
+    """Test that assigning new attributes to links and images changes the
+    rendered tags, even after the tags have been rendered once"""
+    ast = md4c.domparser.DOMParser(md4c.MD_FLAG_WIKILINKS).parse(
+        '[a](x "t") ![b](y) [[z]]\n')
+    link, _, image, _, wikilink = ast.children[0].children
+    ast.render()
+    link.href = link.attr_to_ast([(md4c.TextType.NORMAL, 'u v')])
+    link.title = None
+    image.src = image.attr_to_ast([(md4c.TextType.NORMAL, 'w')])
+    image.title = image.attr_to_ast([(md4c.TextType.NORMAL, '"q"')])
+    wikilink.target = wikilink.attr_to_ast([(md4c.TextType.NORMAL, '<p>')])
+    assert ast.render() == (
+        '<p><a href="u%20v">a</a> <img src="w" alt="b" title="&quot;q&quot;">'
+        ' <x-wikilink data-target="&lt;p&gt;">z</x-wikilink></p>\n')
+
+
+def test_domparser_cached_tags():
+    """Test that the tags rendered from link, image, wiki link, and code block
+    attributes are built once and reused on later renders"""
+    ast = md4c.domparser.DOMParser(md4c.MD_FLAG_WIKILINKS).parse(
+        '[a](x "t") ![b](y "u") [[z]]\n\n```py\nc\n```\n')
+    link, _, image, _, wikilink = ast.children[0].children
+    code_block = ast.children[1]
+    first = ast.render()
+    tags = [link.render_pre(), image.render_pre(image_nesting_level=1),
+            image.render_post(image_nesting_level=1), wikilink.render_pre(),
+            code_block.render_pre()]
+    assert ast.render() == first
+    assert tags[0] is link.render_pre()
+    assert tags[1] is image.render_pre(image_nesting_level=1)
+    assert tags[2] is image.render_post(image_nesting_level=1)
+    assert tags[3] is wikilink.render_pre()
+    assert tags[4] is code_block.render_pre()
+
+
+def test_domparser_lazy_attributes():
+    """Test that link, image, and wiki link attributes converted to nodes only
+    when accessed render the same either way"""
+    markdown = '[a&b](<x&amp;y> "t&#0;") ![b](z "&quot;q") [[w&]]\n'
+    dom_parser = md4c.domparser.DOMParser(md4c.MD_FLAG_WIKILINKS)
+    expected = dom_parser.parse(markdown).render()
+    ast = dom_parser.parse(markdown)
+    link, _, image, _, wikilink = ast.children[0].children
+    assert ''.join(node.text for node in link.href) == 'x&amp;y'
+    assert ''.join(node.text for node in link.title) == 't&#0;'
+    assert ''.join(node.text for node in image.src) == 'z'
+    assert ''.join(node.text for node in image.title) == '&quot;q'
+    assert ''.join(node.text for node in wikilink.target) == 'w&'
+    assert ast.render() == expected
+    assert expected == md4c.HTMLRenderer(md4c.MD_FLAG_WIKILINKS).parse(
+        markdown)
+    assert dom_parser.parse('[a](b)\n').children[0].children[0].title is None
+
+
+def test_domparser_render_kwargs():
+    """Test that extra keyword arguments to render() reach the render_pre()
+    and render_post() of custom classes at any depth, including inside
+    images"""
+    registry = md4c.domparser.NODE_FACTORY
+    original = registry[md4c.SpanType.EM]
+
+    class MarkedEmphasis(md4c.domparser.Emphasis,
+                         element_type=md4c.SpanType.EM):
+        __slots__ = ()
+
+        def render_pre(self, mark='', image_nesting_level=0, **kwargs):
+            return f'{mark}{image_nesting_level}('
+
+        def render_post(self, mark='', image_nesting_level=0, **kwargs):
+            return f'){mark}'
+
+    try:
+        ast = md4c.domparser.DOMParser().parse('> - *a* ![*b*](c)\n')
+    finally:
+        registry[md4c.SpanType.EM] = original
+
+    assert ast.render(mark='!') == (
+        '<blockquote>\n<ul>\n<li>!0(a)! '
+        '<img src="c" alt="!1(b)!"></li>\n</ul>\n</blockquote>\n')
+    assert ast.render() == (
+        '<blockquote>\n<ul>\n<li>0(a) '
+        '<img src="c" alt="1(b)"></li>\n</ul>\n</blockquote>\n')
+
+
+def test_domparser_single_buffer(monkeypatch):
+    """Test that rendering a document renders the built-in nodes below it into
+    one buffer, rather than calling render() and joining at every level"""
+    def render(self, **kwargs):
+        raise AssertionError(f'{type(self).__name__}.render() called')
+
+    markdown = '> - *a* **b** `d`\n>\n>   e &amp; <i>\n\n---\n'
+    expected = md4c.HTMLRenderer().parse(markdown)
+    ast = md4c.domparser.DOMParser().parse(markdown)
+    for cls in set(md4c.domparser.NODE_FACTORY.values()):
+        if cls is not md4c.domparser.HorizontalRule:
+            monkeypatch.setattr(cls, 'render', render)
+    monkeypatch.setattr(md4c.domparser.Document, 'render',
+                        md4c.domparser.ContainerNode.render)
+    assert ast.render() == expected
+
+
+@pytest.mark.parametrize('markdown', [
+    ''.join(f'{"#" * level} h{level}\n' for level in range(1, 7)),
+    'a\n=\n\nb\n-\n',
+])
+def test_domparser_heading_tags(markdown):
+    """Test that headings of every level render the same as with the HTML
+    renderer, for str and bytes, and follow changes to their level"""
+    html_output = md4c.HTMLRenderer().parse(markdown)
+    ast = md4c.domparser.DOMParser().parse(markdown)
+    assert ast.render() == html_output
+    assert (md4c.domparser.DOMParser().parse(markdown.encode()).render() ==
+            html_output.encode())
+    for heading in ast.children:
+        heading.level = 7 - heading.level
+    assert ast.render() == re.sub(
+        r'(</?h)(\d)>', lambda m: f'{m[1]}{7 - int(m[2])}>', html_output)
+
+
+def test_domparser_table_align():
+    """Test that table cells render the tag for their alignment, including
+    after the alignment is changed"""
+    markdown = '| a | b | c | d |\n|---|:--|:-:|--:|\n| e | f | g | h |\n'
+    ast = md4c.domparser.DOMParser(md4c.MD_FLAG_TABLES).parse(markdown)
+    html_output = md4c.HTMLRenderer(md4c.MD_FLAG_TABLES).parse(markdown)
+    assert ast.render() == html_output
+    table = ast.children[0]
+    for section in table.children:
+        for cell in section.children[0].children:
+            cell.align = md4c.Align.CENTER
+    output = ast.render()
+    assert '<th>' not in output and '<td>' not in output
+    assert output.count(' align="center"') == 8
+
+
+def test_domparser_render_to_stream():
+    """Test that render_to_stream() writes the same output render() returns,
+    for both str and bytes"""
+    # Long enough that the output is written in several pieces
+    markdown = '# Title\n\n*a* [b](/c "d") ![e *f*](/g)\n\n- h\n- i\n' * 200
+    ast = md4c.domparser.DOMParser().parse(markdown)
+    stream = io.StringIO()
+    ast.render_to_stream(stream)
+    assert stream.getvalue() == ast.render()
+
+    ast = md4c.domparser.DOMParser().parse(markdown.encode())
+    stream = io.BytesIO()
+    ast.render_to_stream(stream)
+    assert stream.getvalue() == ast.render()
+    buffer = bytearray()
+    ast.render_to_stream(buffer)
+    assert buffer == ast.render()
+
+
+def test_domparser_render_iter():
+    """Test that render_iter() yields the output render() returns, in one
+    piece per child of the node"""
+    markdown = '# Title\n\n*a* [b](/c "d") ![e *f*](/g)\n\n- h\n- i\n'
+    for document in (markdown, markdown.encode()):
+        ast = md4c.domparser.DOMParser().parse(document)
+        pieces = list(ast.render_iter())
+        assert len(pieces) == len(ast.children) + 2
+        assert pieces[0][:0].join(pieces) == ast.render()
+        image = ast.children[1].children[4]
+        assert list(image.render_iter()) == [image.render()]
+
+
+@pytest.mark.parametrize('prefix', ['>', '- ', '1. ', '> * '])
+def test_domparser_deep_nesting(prefix):
+    """Test that rendering deeply nested documents does not hit the recursion
+    limit"""
+    depth = sys.getrecursionlimit() * 2
+    markdown = prefix * depth + ' a\n'
+    html_output = md4c.HTMLRenderer().parse(markdown)
+    dom_output = md4c.domparser.DOMParser().parse(markdown).render()
+    assert dom_output == html_output
+
+
+def test_domparser_render_cache():
+    """Test that cached renders stay correct as the AST is modified"""
+    markdown = '# Title\n\n* one\n* *two*\n\n![alt *text*](a.png)\n'
+    parser = md4c.domparser.DOMParser()
+    ast = parser.parse(markdown)
+    ast.enable_render_cache()
+    expected = md4c.HTMLRenderer().parse(markdown)
+    assert ast.render() == expected
+    assert ast.render() == expected
+
+    # Changes through append() and insert() invalidate the cache
+    paragraph = parser.parse('new\n').children[0]
+    ast.append(paragraph)
+    expected = md4c.HTMLRenderer().parse(markdown + '\nnew\n')
+    assert ast.render() == expected
+    paragraph.insert(0, md4c.domparser.ast.TextNode(
+        md4c.TextType.NORMAL, text='brand '))
+    expected = md4c.HTMLRenderer().parse(markdown + '\nbrand new\n')
+    assert ast.render() == expected
+
+    # Other changes need an explicit invalidation
+    heading = ast.children[0]
+    heading.children[0].text = 'Changed'
+    heading.invalidate_render_cache()
+    expected = md4c.HTMLRenderer().parse(
+        markdown.replace('Title', 'Changed') + '\nbrand new\n')
+    assert ast.render() == expected
+    stream = io.StringIO()
+    ast.render_to_stream(stream)
+    assert stream.getvalue() == expected
+
+
+def test_domparser_image_alt_text():
+    """Test that only the text of spans inside an image is rendered as its
+    alt text, with and without the render cache"""
+    markdown = ('![*a* **b** [c](d) `e` ~~k~~ _u_ $m$ [[w]] &amp; x  \ny\nz]'
+                '(/i "j")\n')
+    flags = (md4c.MD_FLAG_UNDERLINE | md4c.MD_FLAG_STRIKETHROUGH |
+             md4c.MD_FLAG_LATEXMATHSPANS | md4c.MD_FLAG_WIKILINKS)
+    expected = ('<p><img src="/i" alt="a b c e k u m w &amp; x y z" '
+                'title="j"></p>\n')
+    assert md4c.HTMLRenderer(flags).parse(markdown) == expected
+    ast = md4c.domparser.DOMParser(flags).parse(markdown)
+    assert ast.render() == expected
+    ast.enable_render_cache()
+    assert ast.render() == expected
+    assert ast.render() == expected
+
+
+def test_domparser_image_override():
+    """Test that a span class that changes its tags is still rendered inside
+    images, rather than skipped like the built-in spans"""
+    registry = md4c.domparser.NODE_FACTORY
+    original = registry[md4c.SpanType.EM]
+
+    class StarEmphasis(md4c.domparser.Emphasis,
+                       element_type=md4c.SpanType.EM):
+        __slots__ = ()
+
+        def render_pre(self, **kwargs):
+            return '*'
+
+        def render_post(self, **kwargs):
+            return '*'
+
+    try:
+        dom_parser = md4c.domparser.DOMParser()
+        output = dom_parser.parse('![*a* b](/c)\n').render()
+    finally:
+        registry[md4c.SpanType.EM] = original
+
+    assert output == '<p><img src="/c" alt="*a* b"></p>\n'
+
+
+def test_domparser_render_cache_deep_nesting():
+    """Test that rendering deeply nested documents with the render cache
+    enabled does not hit the recursion limit"""
+    depth = sys.getrecursionlimit() * 2
+    markdown = '>' * depth + ' a\n'
+    html_output = md4c.HTMLRenderer().parse(markdown)
+    ast = md4c.domparser.DOMParser().parse(markdown)
+    ast.enable_render_cache()
+    assert ast.render() == html_output
+    assert ast.render() == html_output
+
+
+def test_domparser_deep_image_nesting():
+    """Test that rendering deeply nested images does not hit the recursion
+    limit"""
+    paragraph = md4c.domparser.ASTNode(md4c.BlockType.P)
+    node = paragraph
+    for _ in range(sys.getrecursionlimit() * 2):
+        image = md4c.domparser.ASTNode(
+            md4c.SpanType.IMG, src=[(md4c.TextType.NORMAL, 'x y')])
+        node.append(image)
+        node = image
+    node.append(md4c.domparser.ASTNode(md4c.TextType.NORMAL, text='a&b'))
+    assert paragraph.render() == '<p><img src="x%20y" alt="a&amp;b"></p>\n'
+    assert paragraph.children[0].render() == (
+        '<img src="x%20y" alt="a&amp;b">')
+
+
+def test_domparser_text_init_override():
+    """Test that a text node class with its own __init__() still has it
+    called when the parser builds text nodes"""
+    registry = md4c.domparser.NODE_FACTORY
+    original = registry[md4c.TextType.NORMAL]
+
+    class UpperText(md4c.domparser.NormalText,
+                    element_type=md4c.TextType.NORMAL):
+        __slots__ = ()
+
+        def __init__(self, element_type, text, **kwargs):
+            super().__init__(element_type, text.upper(), **kwargs)
+
+    try:
+        dom_parser = md4c.domparser.DOMParser()
+        ast = dom_parser.parse('a *b*\\\nc\n')
+    finally:
+        registry[md4c.TextType.NORMAL] = original
+
+    assert ast.render() == '<p>A <em>B</em><br>\nC</p>\n'
+    assert not UpperText._direct_init
+    assert original._direct_init
+
+    class Tag:
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.tagged = True
+
+    class TaggedText(Tag, md4c.domparser.NormalText,
+                     element_type=md4c.TextType.NORMAL):
+        pass
+
+    try:
+        ast = md4c.domparser.DOMParser().parse('a *b*\n')
+    finally:
+        registry[md4c.TextType.NORMAL] = original
+
+    assert not TaggedText._direct_init
+    assert ast.children[0].children[0].tagged
+    assert ast.children[0].children[1].children[0].tagged
+
+
+def test_domparser_container_init_override():
+    """Test that a container class with its own __init__() still has it
+    called when the parser builds nodes for blocks and spans"""
+    registry = md4c.domparser.NODE_FACTORY
+    originals = {element_type: registry[element_type]
+                 for element_type in (md4c.BlockType.P, md4c.SpanType.EM)}
+    created = []
+
+    class CountedParagraph(md4c.domparser.Paragraph,
+                           element_type=md4c.BlockType.P):
+        __slots__ = ()
+
+        def __init__(self, element_type, **kwargs):
+            super().__init__(element_type, **kwargs)
+            created.append(self)
+
+    class CountedEmphasis(md4c.domparser.Emphasis,
+                          element_type=md4c.SpanType.EM):
+        __slots__ = ()
+
+        def __init__(self, element_type, **kwargs):
+            super().__init__(element_type, **kwargs)
+            created.append(self)
+
+    try:
+        ast = md4c.domparser.DOMParser().parse('> *a*\n\nb\n')
+    finally:
+        registry.update(originals)
+
+    assert [type(node) for node in created] == [
+        CountedParagraph, CountedEmphasis, CountedParagraph]
+    assert ast.render() == (
+        '<blockquote>\n<p><em>a</em></p>\n</blockquote>\n<p>b</p>\n')
+    assert md4c.domparser.Paragraph._direct_init
+    assert not md4c.domparser.Heading._direct_init
+
+    class Tag:
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.tagged = True
+
+    class TaggedParagraph(Tag, md4c.domparser.Paragraph,
+                          element_type=md4c.BlockType.P):
+        pass
+
+    try:
+        ast = md4c.domparser.DOMParser().parse('> a\n\nb\n')
+    finally:
+        registry.update(originals)
+
+    assert not TaggedParagraph._direct_init
+    assert ast.children[0].children[0].tagged
+    assert ast.children[1].tagged
+
+
+OVERRIDE_FLAGS = (md4c.MD_FLAG_TABLES | md4c.MD_FLAG_STRIKETHROUGH |
+                  md4c.MD_FLAG_UNDERLINE | md4c.MD_FLAG_LATEXMATHSPANS |
+                  md4c.MD_FLAG_WIKILINKS | md4c.MD_FLAG_TASKLISTS |
+                  md4c.MD_FLAG_PERMISSIVEURLAUTOLINKS)
+
+# Contains every block, span, and text type, both inside and outside of an
+# image
+OVERRIDE_MARKDOWN = (
+    '# h *a* **b**\n\n'
+    '> q\\\nr\n\n'
+    '- [ ] s ~~t~~ _u_\n\n'
+    '1. v\n\n'
+    '```py\nfenced\n```\n\n'
+    '<div>x</div>\n\n'
+    '    code <block>\n\n'
+    '---\n\n'
+    '| a | b |\n|---|:-:|\n| c | d |\n\n'
+    'w $x$ $$y$$ [[z|wl]] `c` [l *m*](/u "t") <i>h</i> &amp; \0 n\\\n'
+    'o\np https://e.com/\n\n'
+    '![a *b* **c** ~~d~~ _e_ `f` $g$ $$h$$ [i *j*](/u) [[k|wl]] ![l](/l)'
+    ' <i>m</i> &amp; \0 n\\\no\np](/img.png "t &amp; <u>")\n'
+)
+
+
+def generic_render(node, **kwargs):
+    """Render a node the way ContainerNode.render() originally did: the
+    node's render_pre(), each child, then its render_post()"""
+    if not isinstance(node, md4c.domparser.ContainerNode):
+        return node.render(**kwargs)
+    if node.type is md4c.SpanType.IMG:
+        kwargs = dict(kwargs)
+        kwargs['image_nesting_level'] = (
+            kwargs.get('image_nesting_level', 0) + 1)
+    renderings = [node.render_pre(**kwargs)]
+    renderings.extend(generic_render(child, **kwargs)
+                      for child in node.children)
+    renderings.append(node.render_post(**kwargs))
+    return b''.join(renderings) if node.bytes else ''.join(renderings)
+
+
+def override_class(base, element_type, method):
+    """Subclass base for element_type, overriding method with one that only
+    calls the base class's method"""
+    class Override(base, element_type=element_type):
+        if method == 'render_pre':
+            def render_pre(self, **kwargs):
+                return super().render_pre(**kwargs)
+        elif method == 'render_post':
+            def render_post(self, **kwargs):
+                return super().render_post(**kwargs)
+        elif method == 'render':
+            def render(self, **kwargs):
+                return super().render(**kwargs)
+        elif method == '_render_into':
+            def _render_into(self, out, kwargs):
+                super()._render_into(out, kwargs)
+        elif method == '__init__':
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+
+    return Override
+
+
+@pytest.mark.parametrize('use_bytes', [False, True])
+@pytest.mark.parametrize('method', [
+    None, 'render_pre', 'render_post', 'render', '_render_into', '__init__',
+])
+def test_domparser_override_matrix(method, use_bytes):
+    """Test that subclassing each node class and overriding one of its
+    rendering or construction methods with one that calls the original leaves
+    the output of render(), render_iter(), and render_to_stream() the same as
+    rendering through the generic render_pre()/render_post() path, inside and
+    outside of images"""
+    markdown = OVERRIDE_MARKDOWN.encode() if use_bytes else OVERRIDE_MARKDOWN
+    registry = md4c.domparser.NODE_FACTORY
+    dom_parser = md4c.domparser.DOMParser(OVERRIDE_FLAGS)
+    ast = dom_parser.parse(markdown)
+    expected = {image_nesting_level: generic_render(
+                    ast, image_nesting_level=image_nesting_level)
+                for image_nesting_level in (0, 1)}
+    assert expected[0].count(b'<img' if use_bytes else '<img') == 1
+    for element_type, base in list(registry.items()):
+        if (method in ('render_pre', 'render_post') and
+                not issubclass(base, md4c.domparser.ContainerNode)):
+            continue
+        cls = override_class(base, element_type, method)
+        try:
+            ast = dom_parser.parse(markdown)
+        finally:
+            registry[element_type] = base
+        for image_nesting_level in (0, 1):
+            kwargs = {'image_nesting_level': image_nesting_level}
+            name = (base.__name__, image_nesting_level)
+            assert ast.render(**kwargs) == expected[image_nesting_level], name
+            joined = (b''.join if use_bytes else ''.join)(
+                ast.render_iter(**kwargs))
+            assert joined == expected[image_nesting_level], name
+            stream = io.BytesIO() if use_bytes else io.StringIO()
+            ast.render_to_stream(stream, **kwargs)
+            assert stream.getvalue() == expected[image_nesting_level], name
+        if method is not None:
+            assert any(type(node) is cls for node in iter_nodes(ast)), name
+
+
+def iter_nodes(node):
+    """Yield node and every node below it"""
+    yield node
+    for child in getattr(node, 'children', ()):
+        yield from iter_nodes(child)
+
 #TODO Test keyword arguments for flags
 
 #TODO Test HTML flags
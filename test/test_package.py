@@ -0,0 +1,54 @@
+#
+# PyMD4C
+# Python bindings for MD4C
+#
+# Tests for the top-level md4c package namespace
+#
+# Copyright (c) 2021 Dominick C. Pastore
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+
+import md4c
+import md4c._md4c
+import pytest
+
+
+# Raw enum constants in the C extension are not part of the public namespace
+ENUM_CONST_PREFIXES = ('MD_BLOCK_', 'MD_SPAN_', 'MD_TEXT_', 'MD_ALIGN_')
+
+
+def test_all_covers_extension():
+    """Every public name in the C extension is listed in md4c.__all__"""
+    public = {name for name in dir(md4c._md4c)
+              if not name.startswith('_')
+              and not name.startswith(ENUM_CONST_PREFIXES)}
+    assert public <= set(md4c.__all__)
+
+
+@pytest.mark.parametrize('name', md4c.__all__)
+def test_lazy_attribute(name):
+    """Every name in md4c.__all__ can be accessed and appears in dir()"""
+    assert getattr(md4c, name) is not None
+    assert name in dir(md4c)
+
+
+def test_missing_attribute():
+    with pytest.raises(AttributeError):
+        md4c.NoSuchName